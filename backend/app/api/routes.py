@@ -5,12 +5,12 @@ Contains all route definitions organized as Flask blueprints.
 
 import json
 import os
+import re
 import tempfile
-import threading
 import uuid
 from werkzeug.utils import secure_filename
 
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, current_app, jsonify, request
 
 from app.services.persistence_service import PersistenceManager
 from app.services.chromadb_service import ChromaDBService
@@ -31,6 +31,13 @@ data_ingestion_service = DataIngestionService(chromadb_service, embedding_factor
 # Track upload tasks - in production, use Redis or database
 upload_tasks = {}
 
+# File extensions accepted by the upload endpoint
+ALLOWED_UPLOAD_EXTENSIONS = frozenset({"pdf", "md"})
+
+# ASCII filenames that start with a letter or digit and do not end in "." or
+# "_", which secure_filename returns unchanged on POSIX
+_SAFE_FILENAME = re.compile(r"[A-Za-z0-9][A-Za-z0-9_.-]{0,254}(?<![._])")
+
 
 def _sanitize_settings_response(user_settings):
     """
@@ -212,28 +219,17 @@ def get_history():
     """Get chat conversation history."""
     try:
         # Get all chat history ordered by timestamp
-        chat_history = persistence_manager.get_recent_chat_history(limit=1000)
+        chat_history = persistence_manager.list_recent_chat_history_rows(limit=1000)
 
         # Convert to JSON serializable format
-        history_data = []
         for chat in chat_history:
-            history_data.append(
-                {
-                    "id": chat.id,
-                    "session_id": chat.session_id,
-                    "user_message": chat.user_message,
-                    "bot_response": chat.bot_response,
-                    "timestamp": (
-                        chat.timestamp.isoformat() if chat.timestamp else None
-                    ),
-                    "context_sources": chat.context_sources,
-                }
-            )
+            timestamp = chat["timestamp"]
+            chat["timestamp"] = timestamp.isoformat() if timestamp else None
 
         # Reverse to get chronological order (oldest first)
-        history_data.reverse()
+        chat_history.reverse()
 
-        return jsonify(history_data)
+        return jsonify(chat_history)
 
     except Exception as e:
         return (
@@ -271,7 +267,7 @@ def ingest_data():
         return jsonify({"error": f"An error occurred: {str(e)}"}), 500
 
 
-def _is_allowed_file(filename, allowed_extensions=None):
+def _is_allowed_file(filename, allowed_extensions=ALLOWED_UPLOAD_EXTENSIONS):
     """
     Check if the uploaded file has an allowed extension.
 
@@ -282,10 +278,8 @@ def _is_allowed_file(filename, allowed_extensions=None):
     Returns:
         bool: True if file extension is allowed
     """
-    if allowed_extensions is None:
-        allowed_extensions = {"pdf", "md"}
-
-    return "." in filename and filename.rsplit(".", 1)[1].lower() in allowed_extensions
+    _, dot, extension = filename.rpartition(".")
+    return bool(dot) and extension.lower() in allowed_extensions
 
 
 def _determine_file_type(filename):
@@ -310,6 +304,45 @@ def _determine_file_type(filename):
         raise ValueError(f"Unsupported file type: {file_extension}")
 
 
+def _save_upload(file, destination):
+    """
+    Save an uploaded file, hard-linking it when it is already spooled to disk.
+
+    Args:
+        file: Uploaded FileStorage object
+        destination: Path to save the file to
+    """
+    spooled_path = getattr(file.stream, "name", None)
+    if isinstance(spooled_path, str):
+        try:
+            file.stream.flush()
+            os.link(spooled_path, destination)
+            return
+        except OSError:
+            # Different filesystem or no hard-link support, fall back to a copy
+            pass
+
+    file.save(destination)
+
+
+def _submit_ingestion_task(func, *args):
+    """
+    Run an ingestion task on the application's bounded worker pool.
+
+    When INGESTION_TASKS_EAGER is set the task runs inline instead, so its
+    status is final by the time the request returns.
+
+    Args:
+        func: Task function to run
+        *args: Positional arguments for the task function
+    """
+    if current_app.config.get("INGESTION_TASKS_EAGER"):
+        func(*args)
+        return
+
+    current_app.extensions["ingestion_executor"].submit(func, *args)
+
+
 def _process_upload_async(task_id, file_path, original_filename):
     """
     Process uploaded file asynchronously in background thread.
@@ -446,8 +479,11 @@ def upload_file():
         # Generate unique task ID
         task_id = str(uuid.uuid4())
 
-        # Secure the filename
-        filename = secure_filename(file.filename)
+        # Secure the filename, skipping the full sanitizer for plain ASCII names
+        if _SAFE_FILENAME.fullmatch(file.filename):
+            filename = file.filename
+        else:
+            filename = secure_filename(file.filename)
         if not filename:
             filename = f"upload_{task_id}.pdf"
 
@@ -456,7 +492,7 @@ def upload_file():
         temp_file_path = os.path.join(temp_dir, f"{task_id}_{filename}")
 
         # Save uploaded file to temporary location
-        file.save(temp_file_path)
+        _save_upload(file, temp_file_path)
 
         # Initialize task tracking
         upload_tasks[task_id] = {
@@ -466,12 +502,8 @@ def upload_file():
             "message": "File uploaded, processing queued",
         }
 
-        # Start async processing in background thread
-        processing_thread = threading.Thread(
-            target=_process_upload_async, args=(task_id, temp_file_path, filename)
-        )
-        processing_thread.daemon = True
-        processing_thread.start()
+        # Queue processing on the ingestion worker pool
+        _submit_ingestion_task(_process_upload_async, task_id, temp_file_path, filename)
 
         # Return immediate response with task ID
         return (
@@ -490,6 +522,43 @@ def upload_file():
         return jsonify({"error": f"Upload failed: {str(e)}"}), 500
 
 
+def _validate_data_source_payload(data):
+    """
+    Validate the JSON payload of a data source addition request.
+
+    Args:
+        data: Parsed JSON request body
+
+    Returns:
+        str: Error message if the payload is invalid, None otherwise
+    """
+    if not isinstance(data, dict) or "type" not in data or "value" not in data:
+        return "Missing 'type' or 'value' field in request"
+
+    source_type = data["type"]
+    source_value = data["value"]
+
+    # Validate source type
+    allowed_types = {"url", "markdown"}
+    if source_type not in allowed_types:
+        allowed_types_str = ", ".join(allowed_types)
+        return f"Invalid source type. Allowed types: {allowed_types_str}"
+
+    # Validate source value
+    if (
+        not source_value
+        or not isinstance(source_value, str)
+        or not source_value.strip()
+    ):
+        return "Source value must be a non-empty string"
+
+    # Additional validation for URL type
+    if source_type == "url" and not source_value.startswith(("http://", "https://")):
+        return "URL must start with http:// or https://"
+
+    return None
+
+
 @api_bp.route("/api/data_source/add", methods=["POST"])
 def add_data_source():
     """
@@ -520,38 +589,13 @@ def add_data_source():
         if data is None:
             return jsonify({"error": "No JSON data provided"}), 400
 
-        if "type" not in data or "value" not in data:
-            return jsonify({"error": "Missing 'type' or 'value' field in request"}), 400
+        error = _validate_data_source_payload(data)
+        if error:
+            return jsonify({"error": error}), 400
 
         source_type = data["type"]
         source_value = data["value"]
 
-        # Validate source type
-        allowed_types = {"url", "markdown"}
-        if source_type not in allowed_types:
-            allowed_types_str = ", ".join(allowed_types)
-            error_msg = f"Invalid source type. Allowed types: {allowed_types_str}"
-            return jsonify({"error": error_msg}), 400
-
-        # Validate source value
-        if (
-            not source_value
-            or not isinstance(source_value, str)
-            or not source_value.strip()
-        ):
-            return jsonify({"error": "Source value must be a non-empty string"}), 400
-
-        # Additional validation for URL type
-        if source_type == "url":
-            if not (
-                source_value.startswith("http://")
-                or source_value.startswith("https://")
-            ):
-                return (
-                    jsonify({"error": "URL must start with http:// or https://"}),
-                    400,
-                )
-
         # Generate unique task ID
         task_id = str(uuid.uuid4())
 
@@ -564,12 +608,10 @@ def add_data_source():
             "message": "Data source queued for processing",
         }
 
-        # Start async processing in background thread
-        processing_thread = threading.Thread(
-            target=_process_data_source_async, args=(task_id, source_type, source_value)
+        # Queue processing on the ingestion worker pool
+        _submit_ingestion_task(
+            _process_data_source_async, task_id, source_type, source_value
         )
-        processing_thread.daemon = True
-        processing_thread.start()
 
         # Return immediate response with task ID
         return (
@@ -47,6 +47,23 @@ class Config:
     OPENAI_API_KEY = os.environ.get("OPENAI_API_KEY")
     HUGGINGFACE_API_TOKEN = os.environ.get("HUGGINGFACE_API_TOKEN")
 
+    # Background ingestion configuration
+    INGESTION_MAX_WORKERS = int(os.environ.get("INGESTION_MAX_WORKERS", 8))
+    INGESTION_TASKS_EAGER = False
+
+    # Load the in-process whisper model in the background at startup
+    WHISPER_PRELOAD_MODEL = os.environ.get("WHISPER_PRELOAD_MODEL", "").lower() in [
+        "true",
+        "1",
+        "yes",
+    ]
+
+    def __init__(self):
+        """Re-read settings that may change after import from the environment."""
+        self.CHROMADB_PERSIST_PATH = os.environ.get(
+            "CHROMADB_PERSIST_PATH", "db/chroma"
+        )
+
 
 class DevelopmentConfig(Config):
     """Development configuration."""
@@ -67,6 +84,9 @@ class TestingConfig(Config):
     DEBUG = True
     SQLALCHEMY_DATABASE_URI = "sqlite:///:memory:"
 
+    # Run ingestion tasks inline so task status is final when the request returns
+    INGESTION_TASKS_EAGER = True
+
 
 # Configuration dictionary
 config = {
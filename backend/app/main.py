@@ -3,14 +3,44 @@ Main Flask application for the RAG chatbot.
 """
 
 import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 
-from flask import Flask
+from flask import Flask, Request
 from flask_cors import CORS
 
-from app.api.routes import api_bp
+from app.api.routes import api_bp, data_ingestion_service
 from app.config.config import config
 from app.models.models import init_db
 
+# Uploads at or below this size stay in memory, matching Werkzeug's default
+_SPOOL_TO_DISK_THRESHOLD = 500 * 1024
+
+
+class UploadRequest(Request):
+    """Request that spools large uploaded files to named temporary files."""
+
+    def _get_file_stream(
+        self, total_content_length, content_type, filename=None, content_length=None
+    ):
+        """
+        Return a named temporary file for each large uploaded file.
+
+        Werkzeug otherwise spools large uploads to an anonymous temporary file
+        that has to be copied again when saved. A named file can be hard-linked
+        into place instead, and is removed when Werkzeug closes the request.
+        Small uploads keep Werkzeug's in-memory buffer.
+        """
+        if (
+            total_content_length is not None
+            and total_content_length <= _SPOOL_TO_DISK_THRESHOLD
+        ):
+            return super()._get_file_stream(
+                total_content_length, content_type, filename, content_length
+            )
+
+        return tempfile.NamedTemporaryFile(mode="wb+")
+
 
 def create_app(config_name=None):
     """
@@ -23,6 +53,7 @@ def create_app(config_name=None):
         Flask: Configured Flask application instance
     """
     app = Flask(__name__)
+    app.request_class = UploadRequest
 
     # Determine configuration
     config_name = config_name or os.environ.get("FLASK_ENV", "default")
@@ -34,6 +65,18 @@ def create_app(config_name=None):
     # Initialize database
     init_db(app)
 
+    # Bounded worker pool for background ingestion tasks
+    app.extensions["ingestion_executor"] = ThreadPoolExecutor(
+        max_workers=app.config["INGESTION_MAX_WORKERS"],
+        thread_name_prefix="ingestion",
+    )
+
+    # Warm the whisper model so the first YouTube ingestion does not pay for it
+    if app.config.get("WHISPER_PRELOAD_MODEL"):
+        app.extensions["ingestion_executor"].submit(
+            data_ingestion_service.whisper_service.preload_model
+        )
+
     # Register API blueprint
     app.register_blueprint(api_bp)
 
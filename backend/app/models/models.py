@@ -6,7 +6,7 @@ Defines SQLAlchemy models for persistent data storage.
 from datetime import datetime
 
 from flask_sqlalchemy import SQLAlchemy
-from sqlalchemy import LargeBinary, Text
+from sqlalchemy import LargeBinary, Text, event
 
 # Initialize SQLAlchemy instance
 db = SQLAlchemy()
@@ -103,6 +103,11 @@ class DataSource(db.Model):
     """
 
     __tablename__ = "data_sources"
+    __table_args__ = (
+        # Serve status/type filters from the index instead of a table scan
+        db.Index("ix_data_source_status_type", "status", "source_type"),
+        db.Index("ix_data_source_source_type", "source_type"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
 
@@ -146,6 +151,7 @@ class Transcription(db.Model):
     """
 
     __tablename__ = "transcriptions"
+    __table_args__ = (db.Index("ix_transcription_status", "status"),)
 
     id = db.Column(db.Integer, primary_key=True)
 
@@ -192,6 +198,33 @@ class Transcription(db.Model):
         return f"<Transcription {self.original_filename}: {self.status}>"
 
 
+# Applied to every new SQLite connection. WAL with synchronous=NORMAL turns
+# commits into log appends with far fewer fsyncs; the tradeoff is that a power
+# loss or OS crash may roll back the most recently committed transactions.
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+)
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """
+    Tune a freshly opened SQLite connection for write throughput.
+
+    Args:
+        dbapi_connection: Raw DB-API connection
+        connection_record: SQLAlchemy connection pool record (unused)
+    """
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
+
+
 def init_db(app):
     """
     Initialize the database with the Flask application.
@@ -202,10 +235,21 @@ def init_db(app):
     db.init_app(app)
 
     with app.app_context():
+        # In-memory databases have no journal to tune
+        database_uri = app.config["SQLALCHEMY_DATABASE_URI"]
+        if database_uri.startswith("sqlite") and ":memory:" not in database_uri:
+            if not event.contains(db.engine, "connect", _set_sqlite_pragmas):
+                event.listen(db.engine, "connect", _set_sqlite_pragmas)
+
         print("Initializing database...")
 
         # Create all tables
         db.create_all()
+
+        # create_all skips existing tables, so add indexes they predate
+        for table in db.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(bind=db.engine, checkfirst=True)
         print("✅ Database tables created")
 
         # Create default user settings if not exists
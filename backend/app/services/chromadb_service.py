@@ -11,11 +11,15 @@ from typing import Any, Dict, List, Optional, Union
 import chromadb
 from chromadb import Collection
 from chromadb.config import Settings
+from chromadb.errors import NotFoundError
 from flask import current_app
 
 # Configure logger
 logger = logging.getLogger(__name__)
 
+# Number of documents sent to ChromaDB per add() call
+DEFAULT_ADD_BATCH_SIZE = 500
+
 
 class ChromaDBService:
     """
@@ -87,11 +91,11 @@ class ChromaDBService:
                     name=name, embedding_function=embedding_function
                 )
                 logger.info("Retrieved existing collection: %s", name)
-            except ValueError:
+            except (ValueError, NotFoundError):
                 # Collection doesn't exist, create it
                 collection = client.create_collection(
                     name=name,
-                    metadata=metadata or {},
+                    metadata=metadata or None,
                     embedding_function=embedding_function,
                 )
                 logger.info("Created new collection: %s", name)
@@ -150,30 +154,55 @@ class ChromaDBService:
         metadatas: Optional[List[Dict[str, Any]]] = None,
         ids: Optional[List[str]] = None,
         embeddings: Optional[List[List[float]]] = None,
+        batch_size: int = DEFAULT_ADD_BATCH_SIZE,
     ) -> bool:
         """
         Add documents to a collection.
 
+        Documents are written in batches so each ChromaDB transaction covers
+        many rows instead of one. If a batch fails, the documents added by
+        earlier batches are deleted again so the collection is not left
+        partially ingested. IDs that already existed before this call are
+        never deleted, since add() leaves those documents untouched.
+
         Args:
             collection_name: Name of the collection
             documents: List of document texts
             metadatas: Optional list of metadata dicts
             ids: Optional list of document IDs
             embeddings: Optional list of embeddings (if not provided, will be computed)
+            batch_size: Maximum number of documents per add() call
 
         Returns:
             True if successful, False otherwise
         """
+        collection = None
+        added_ids: List[str] = []
         try:
             collection = self.get_or_create_collection(collection_name)
 
-            # Generate IDs if not provided
+            # Generated IDs are fresh, so only caller IDs can already exist
+            check_existing = ids is not None
             if ids is None:
                 ids = [f"doc_{uuid.uuid4().hex[:8]}_{i}" for i in range(len(documents))]
 
-            collection.add(
-                documents=documents, metadatas=metadatas, ids=ids, embeddings=embeddings
-            )
+            for start in range(0, len(documents), batch_size):
+                end = start + batch_size
+                batch_ids = ids[start:end]
+                existing_ids = (
+                    set(collection.get(ids=batch_ids, include=[])["ids"])
+                    if check_existing
+                    else set()
+                )
+                collection.add(
+                    documents=documents[start:end],
+                    metadatas=metadatas[start:end] if metadatas else None,
+                    ids=batch_ids,
+                    embeddings=embeddings[start:end] if embeddings else None,
+                )
+                added_ids.extend(
+                    doc_id for doc_id in batch_ids if doc_id not in existing_ids
+                )
 
             logger.info(
                 "Added %d documents to collection '%s'", len(documents), collection_name
@@ -183,27 +212,62 @@ class ChromaDBService:
             logger.error(
                 "Invalid data format for collection '%s': %s", collection_name, e
             )
-            return False
         except Exception as e:
             logger.error(
                 "Unexpected error adding documents to collection '%s': %s",
                 collection_name,
                 e,
             )
-            return False
+
+        self._remove_partial_add(collection, collection_name, added_ids)
+        return False
+
+    def _remove_partial_add(
+        self, collection: Optional[Collection], collection_name: str, ids: List[str]
+    ) -> None:
+        """
+        Delete documents written by the earlier batches of a failed add.
+
+        Args:
+            collection: Collection the documents were added to
+            collection_name: Name of the collection
+            ids: IDs of the documents that did not exist before the add
+        """
+        if collection is None or not ids:
+            return
+
+        try:
+            collection.delete(ids=ids)
+            logger.info(
+                "Removed %d partially added documents from collection '%s'",
+                len(ids),
+                collection_name,
+            )
+        except Exception as e:
+            logger.error(
+                "Failed to remove %d partially added documents from collection "
+                "'%s': %s",
+                len(ids),
+                collection_name,
+                e,
+            )
 
     def query_documents(
         self,
         collection_name: str,
-        query_texts: Union[str, List[str]],
+        query_texts: Optional[Union[str, List[str]]] = None,
         n_results: int = 10,
         where: Optional[Dict[str, Any]] = None,
         where_document: Optional[Dict[str, Any]] = None,
         include: Optional[List[str]] = None,
+        query_embeddings: Optional[List[List[float]]] = None,
     ) -> Optional[Dict[str, Any]]:
         """
         Query documents from a collection.
 
+        Pass precomputed query_embeddings instead of query_texts to skip
+        encoding the query with the collection's embedding function.
+
         Args:
             collection_name: Name of the collection
             query_texts: Query text(s)
@@ -211,11 +275,17 @@ class ChromaDBService:
             where: Metadata filter conditions
             where_document: Document filter conditions
             include: What to include in results ['metadatas', 'documents', 'distances']
+            query_embeddings: Precomputed query embedding(s)
 
         Returns:
             Query results or None if error
         """
         try:
+            if (query_texts is None) == (query_embeddings is None):
+                raise ValueError(
+                    "Exactly one of query_texts or query_embeddings is required"
+                )
+
             collection = self.get_or_create_collection(collection_name)
 
             if isinstance(query_texts, str):
@@ -223,6 +293,7 @@ class ChromaDBService:
 
             results = collection.query(
                 query_texts=query_texts,
+                query_embeddings=query_embeddings,
                 n_results=n_results,
                 where=where,
                 where_document=where_document,
@@ -232,7 +303,7 @@ class ChromaDBService:
             logger.info(
                 "Queried collection '%s' with %d queries",
                 collection_name,
-                len(query_texts),
+                len(query_texts or query_embeddings),
             )
             return results
         except Exception as e:
@@ -332,62 +332,21 @@ class DataIngestionService:
 
             logger.info(f"Audio file downloaded: {downloaded_file_path}")
 
-            # 3. Transcribe audio using whisper.cpp
-            transcribed_text = None
+            # 3-6. Transcribe, embed and store, removing the audio file afterwards
             try:
-                transcribed_text = self.whisper_service.transcribe_audio(
-                    downloaded_file_path
+                success = self._store_youtube_audio(
+                    youtube_url, downloaded_file_path, metadata
                 )
-                if transcribed_text:
-                    char_count = len(transcribed_text)
-                    logger.info(
-                        f"YouTube audio transcription completed: "
-                        f"{char_count} characters"
-                    )
-                else:
-                    logger.warning("Transcription returned no text")
-            except Exception as e:
-                logger.error(f"Audio transcription failed: {e}")
-                # Continue with processing even if transcription fails
-                transcribed_text = None
-
-            # 4. Create metadata for the YouTube video
-            combined_metadata = metadata or {}
-            combined_metadata.update(
-                {
-                    "source_type": "youtube",
-                    "youtube_url": youtube_url,
-                    "audio_file_path": downloaded_file_path,
-                    "content_type": "audio/mp3",
-                    "transcription_available": transcribed_text is not None,
-                }
-            )
-
-            # 5. Prepare text content for embedding
-            if transcribed_text:
-                # Use transcribed text as the main content
-                text_content = transcribed_text
-            else:
-                # Fallback to URL only if transcription fails
-                text_content = f"YouTube video: {youtube_url}"
-                logger.warning("Using URL only as no transcription was available")
-
-            # 6. Use common method for chunking, embedding, and storing
-            success = self._chunk_embed_and_store(
-                text_content, combined_metadata, f"YouTube content from {youtube_url}"
-            )
-
-            # 7. Clean up audio file after processing
-            try:
-                if self.youtube_downloader.cleanup_file(downloaded_file_path):
-                    logger.info(f"Cleaned up audio file: {downloaded_file_path}")
-            except Exception as e:
-                logger.warning(f"Failed to clean up audio file: {e}")
+            finally:
+                # 7. Clean up audio file even if transcription or storage failed
+                try:
+                    if self.youtube_downloader.cleanup_file(downloaded_file_path):
+                        logger.info(f"Cleaned up audio file: {downloaded_file_path}")
+                except Exception as e:
+                    logger.warning(f"Failed to clean up audio file: {e}")
 
             if success:
                 logger.info(f"Successfully processed YouTube URL: {youtube_url}")
-                if transcribed_text:
-                    logger.info("Content includes audio transcription")
 
             return success
 
@@ -396,3 +355,70 @@ class DataIngestionService:
                 f"Error processing YouTube URL {youtube_url}: {e}", exc_info=True
             )
             return False
+
+    def _store_youtube_audio(
+        self,
+        youtube_url: str,
+        downloaded_file_path: str,
+        metadata: Optional[Dict] = None,
+    ) -> bool:
+        """
+        Transcribe downloaded YouTube audio, then chunk, embed and store it.
+
+        Args:
+            youtube_url: The YouTube URL the audio was downloaded from.
+            downloaded_file_path: Path to the downloaded audio file.
+            metadata: Optional metadata to associate with the YouTube content.
+
+        Returns:
+            True if the content was stored successfully, False otherwise.
+        """
+        # 3. Transcribe audio using whisper.cpp
+        transcribed_text = None
+        try:
+            transcribed_text = self.whisper_service.transcribe_audio(
+                downloaded_file_path
+            )
+            if transcribed_text:
+                char_count = len(transcribed_text)
+                logger.info(
+                    f"YouTube audio transcription completed: "
+                    f"{char_count} characters"
+                )
+            else:
+                logger.warning("Transcription returned no text")
+        except Exception as e:
+            logger.error(f"Audio transcription failed: {e}")
+            # Continue with processing even if transcription fails
+            transcribed_text = None
+
+        # 4. Create metadata for the YouTube video
+        combined_metadata = metadata or {}
+        combined_metadata.update(
+            {
+                "source_type": "youtube",
+                "youtube_url": youtube_url,
+                "audio_file_path": downloaded_file_path,
+                "content_type": "audio/mp3",
+                "transcription_available": transcribed_text is not None,
+            }
+        )
+
+        # 5. Prepare text content for embedding
+        if transcribed_text:
+            # Use transcribed text as the main content
+            text_content = transcribed_text
+        else:
+            # Fallback to URL only if transcription fails
+            text_content = f"YouTube video: {youtube_url}"
+            logger.warning("Using URL only as no transcription was available")
+
+        # 6. Use common method for chunking, embedding, and storing
+        success = self._chunk_embed_and_store(
+            text_content, combined_metadata, f"YouTube content from {youtube_url}"
+        )
+
+        if success and transcribed_text:
+            logger.info("Content includes audio transcription")
+
+        return success
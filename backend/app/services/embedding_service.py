@@ -7,7 +7,7 @@ import logging
 import os
 from typing import Any, Optional
 
-from flask import current_app
+from flask import current_app, has_app_context
 
 # LangChain imports - placed at top per code standards
 from langchain_huggingface import HuggingFaceEmbeddings
@@ -17,6 +17,11 @@ from langchain_openai import OpenAIEmbeddings
 logger = logging.getLogger(__name__)
 
 
+def _in_flask_context() -> bool:
+    """Return True when a Flask app context is active to read config from."""
+    return has_app_context()
+
+
 class EmbeddingFactory:
     """
     Factory class for creating embedding models from different providers.
@@ -50,7 +55,7 @@ class EmbeddingFactory:
             RuntimeError: If configuration is invalid
         """
         # Get configuration from Flask app config or use provided values
-        if hasattr(current_app, "config"):
+        if _in_flask_context():
             provider = provider or current_app.config.get(
                 "EMBEDDING_PROVIDER", "huggingface"
             )
@@ -96,7 +101,7 @@ class EmbeddingFactory:
 
         # Get API token from parameter, Flask config, or environment
         if api_key is None:
-            if hasattr(current_app, "config"):
+            if _in_flask_context():
                 api_key = current_app.config.get("HUGGINGFACE_API_TOKEN")
             else:
                 api_key = os.environ.get("HUGGINGFACE_API_TOKEN")
@@ -134,7 +139,7 @@ class EmbeddingFactory:
         """
         # Get API token from parameter, Flask config, or environment
         if api_key is None:
-            if hasattr(current_app, "config"):
+            if _in_flask_context():
                 api_key = current_app.config.get("OPENAI_API_KEY")
             else:
                 api_key = os.environ.get("OPENAI_API_KEY")
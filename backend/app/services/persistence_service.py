@@ -6,17 +6,62 @@ Provides a clean interface for all database operations (CRUD) for all models.
 import json
 import logging
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from functools import lru_cache
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
 
 from cryptography.fernet import Fernet
 from flask import current_app
+from sqlalchemy import select
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import load_only
 
 from app.models.models import ChatHistory, DataSource, Transcription, UserSettings, db
 
 # Configure logger
 logger = logging.getLogger(__name__)
 
+# Columns returned by the read-only chat history listing
+_CHAT_LIST_COLS = (
+    ChatHistory.id,
+    ChatHistory.session_id,
+    ChatHistory.user_message,
+    ChatHistory.bot_response,
+    ChatHistory.timestamp,
+    ChatHistory.context_sources,
+)
+
+
+def _apply_load_only(query, model, columns: Optional[Sequence[str]]):
+    """
+    Restrict a query to the given column names via ``load_only``.
+
+    Args:
+        query: SQLAlchemy query to restrict
+        model: Model class the column names belong to
+        columns: Column names to load, or None to load every column
+
+    Returns:
+        The (possibly restricted) query
+    """
+    if not columns:
+        return query
+    return query.options(load_only(*(getattr(model, name) for name in columns)))
+
+
+@lru_cache(maxsize=4)
+def _get_cipher(encryption_key: bytes) -> Fernet:
+    """
+    Build a Fernet cipher for a key, reusing it across managers.
+
+    Args:
+        encryption_key: URL-safe base64-encoded Fernet key
+
+    Returns:
+        Fernet instance for the key
+    """
+    return Fernet(encryption_key)
+
 
 class PersistenceManager:
     """
@@ -43,9 +88,9 @@ class PersistenceManager:
                     # If the key is a string, encode it to bytes
                     if isinstance(encryption_key, str):
                         encryption_key = encryption_key.encode()
-                    self._fernet = Fernet(encryption_key)
+                    self._fernet = _get_cipher(encryption_key)
                 except Exception as e:
-                    logger.error(f"Failed to initialize Fernet with provided key: {e}")
+                    logger.error("Failed to initialize Fernet with provided key: %s", e)
                     return None
             else:
                 logger.warning(
@@ -79,7 +124,7 @@ class PersistenceManager:
             logger.debug("API keys encrypted successfully")
             return encrypted_data
         except Exception as e:
-            logger.error(f"Failed to encrypt API keys: {e}")
+            logger.error("Failed to encrypt API keys: %s", e)
             return None
 
     def decrypt_key(self, encrypted_data: bytes) -> Optional[Dict[str, Any]]:
@@ -108,7 +153,7 @@ class PersistenceManager:
             logger.debug("API keys decrypted successfully")
             return data
         except Exception as e:
-            logger.error(f"Failed to decrypt API keys: {e}")
+            logger.error("Failed to decrypt API keys: %s", e)
             return None
 
     # UserSettings CRUD operations
@@ -150,7 +195,7 @@ class PersistenceManager:
             return user_settings
         except SQLAlchemyError as e:
             db.session.rollback()
-            logger.error(f"Error creating user settings: {e}")
+            logger.error("Error creating user settings: %s", e)
             return None
 
     def get_user_settings_by_id(self, settings_id: int) -> Optional[UserSettings]:
@@ -158,7 +203,7 @@ class PersistenceManager:
         try:
             return UserSettings.query.get(settings_id)
         except SQLAlchemyError as e:
-            logger.error(f"Error retrieving user settings by ID: {e}")
+            logger.error("Error retrieving user settings by ID: %s", e)
             return None
 
     def get_user_settings_by_user_id(self, user_id: str) -> Optional[UserSettings]:
@@ -166,7 +211,7 @@ class PersistenceManager:
         try:
             return UserSettings.query.filter_by(user_id=user_id).first()
         except SQLAlchemyError as e:
-            logger.error(f"Error retrieving user settings by user ID: {e}")
+            logger.error("Error retrieving user settings by user ID: %s", e)
             return None
 
     def get_api_keys(self, user_id: str) -> Optional[Dict[str, Any]]:
@@ -186,7 +231,7 @@ class PersistenceManager:
 
             return self.decrypt_key(user_settings.api_keys)
         except Exception as e:
-            logger.error(f"Error getting API keys for user {user_id}: {e}")
+            logger.error("Error getting API keys for user %s: %s", user_id, e)
             return None
 
     def set_api_keys(self, user_id: str, api_keys: Dict[str, Any]) -> bool:
@@ -234,7 +279,7 @@ class PersistenceManager:
             return True
         except SQLAlchemyError as e:
             db.session.rollback()
-            logger.error(f"Error setting API keys for user {user_id}: {e}")
+            logger.error("Error setting API keys for user %s: %s", user_id, e)
             return False
 
     def update_user_settings(
@@ -259,9 +304,13 @@ class PersistenceManager:
 
             # Validate kwargs - only allow valid model attributes
             valid_attributes = {"user_id", "api_keys", "custom_prompts"}
+            invalid_keys = kwargs.keys() - valid_attributes
+            if invalid_keys:
+                logger.warning(
+                    "Invalid attributes in kwargs, skipping: %s", sorted(invalid_keys)
+                )
             for key, value in kwargs.items():
-                if key not in valid_attributes:
-                    logger.warning(f"Invalid attribute '{key}' in kwargs, skipping")
+                if key in invalid_keys:
                     continue
 
                 if key == "api_keys" and value is not None:
@@ -280,7 +329,7 @@ class PersistenceManager:
             return user_settings
         except SQLAlchemyError as e:
             db.session.rollback()
-            logger.error(f"Error updating user settings: {e}")
+            logger.error("Error updating user settings: %s", e)
             return None
 
     def delete_user_settings(self, settings_id: int) -> bool:
@@ -295,7 +344,7 @@ class PersistenceManager:
             return True
         except SQLAlchemyError as e:
             db.session.rollback()
-            logger.error(f"Error deleting user settings: {e}")
+            logger.error("Error deleting user settings: %s", e)
             return False
 
     # ChatHistory CRUD operations
@@ -333,7 +382,30 @@ class PersistenceManager:
             return chat_history
         except SQLAlchemyError as e:
             db.session.rollback()
-            logger.error(f"Error creating chat history: {e}")
+            logger.error("Error creating chat history: %s", e)
+            return None
+
+    def bulk_create_chat_history(
+        self, rows: Sequence[Dict[str, Any]]
+    ) -> Optional[List[ChatHistory]]:
+        """
+        Create several chat history records in a single transaction.
+
+        Args:
+            rows: Keyword arguments for each record, as accepted by
+                create_chat_history
+
+        Returns:
+            List of ChatHistory objects if successful, None if failed
+        """
+        try:
+            chat_histories = [ChatHistory(**row) for row in rows]
+            db.session.add_all(chat_histories)
+            db.session.commit()
+            return chat_histories
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            logger.error("Error creating chat history records: %s", e)
             return None
 
     def get_chat_history_by_id(self, chat_id: int) -> Optional[ChatHistory]:
@@ -341,7 +413,7 @@ class PersistenceManager:
         try:
             return ChatHistory.query.get(chat_id)
         except SQLAlchemyError as e:
-            logger.error(f"Error retrieving chat history by ID: {e}")
+            logger.error("Error retrieving chat history by ID: %s", e)
             return None
 
     def get_chat_history_by_session(
@@ -356,7 +428,7 @@ class PersistenceManager:
                 .all()
             )
         except SQLAlchemyError as e:
-            logger.error(f"Error retrieving chat history by session: {e}")
+            logger.error("Error retrieving chat history by session: %s", e)
             return []
 
     def update_chat_history(self, chat_id: int, **kwargs) -> Optional[ChatHistory]:
@@ -383,9 +455,13 @@ class PersistenceManager:
                 "user_settings_id",
                 "context_sources",
             }
+            invalid_keys = kwargs.keys() - valid_attributes
+            if invalid_keys:
+                logger.warning(
+                    "Invalid attributes in kwargs, skipping: %s", sorted(invalid_keys)
+                )
             for key, value in kwargs.items():
-                if key not in valid_attributes:
-                    logger.warning(f"Invalid attribute '{key}' in kwargs, skipping")
+                if key in invalid_keys:
                     continue
                 if hasattr(chat_history, key):
                     setattr(chat_history, key, value)
@@ -394,7 +470,7 @@ class PersistenceManager:
             return chat_history
         except SQLAlchemyError as e:
             db.session.rollback()
-            logger.error(f"Error updating chat history: {e}")
+            logger.error("Error updating chat history: %s", e)
             return None
 
     def delete_chat_history(self, chat_id: int) -> bool:
@@ -409,7 +485,7 @@ class PersistenceManager:
             return True
         except SQLAlchemyError as e:
             db.session.rollback()
-            logger.error(f"Error deleting chat history: {e}")
+            logger.error("Error deleting chat history: %s", e)
             return False
 
     def delete_chat_session(self, session_id: str) -> bool:
@@ -419,14 +495,58 @@ class PersistenceManager:
             deleted_count = ChatHistory.query.filter_by(session_id=session_id).delete()
             db.session.commit()
             logger.info(
-                f"Deleted {deleted_count} chat records for session {session_id}"
+                "Deleted %s chat records for session %s", deleted_count, session_id
             )
             return True
         except SQLAlchemyError as e:
             db.session.rollback()
-            logger.error(f"Error deleting chat session: {e}")
+            logger.error("Error deleting chat session: %s", e)
             return False
 
+    def delete_chat_sessions(
+        self,
+        session_ids: Iterable[str],
+        chunk_size: int = 500,
+        commit_per_chunk: bool = False,
+    ) -> int:
+        """
+        Delete all chat history for several sessions.
+
+        Issues one ``DELETE ... WHERE session_id IN (...)`` per chunk of
+        session IDs instead of one statement per session.
+
+        Args:
+            session_ids: Session identifiers to delete
+            chunk_size: Maximum number of session IDs per DELETE statement
+            commit_per_chunk: Commit after every chunk to keep very large
+                deletions from holding a single long transaction
+
+        Returns:
+            Number of committed deleted chat records
+        """
+        session_ids = iter(session_ids)
+        deleted_count = 0
+        committed_count = 0
+        try:
+            while True:
+                chunk = list(islice(session_ids, chunk_size))
+                if not chunk:
+                    break
+                deleted_count += ChatHistory.query.filter(
+                    ChatHistory.session_id.in_(chunk)
+                ).delete(synchronize_session=False)
+                if commit_per_chunk:
+                    db.session.commit()
+                    committed_count = deleted_count
+
+            db.session.commit()
+            logger.info("Deleted %s chat records across sessions", deleted_count)
+            return deleted_count
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            logger.error("Error deleting chat sessions: %s", e)
+            return committed_count
+
     # DataSource CRUD operations
     def create_data_source(
         self,
@@ -465,7 +585,7 @@ class PersistenceManager:
             return data_source
         except SQLAlchemyError as e:
             db.session.rollback()
-            logger.error(f"Error creating data source: {e}")
+            logger.error("Error creating data source: %s", e)
             return None
 
     def get_data_source_by_id(self, source_id: int) -> Optional[DataSource]:
@@ -473,25 +593,76 @@ class PersistenceManager:
         try:
             return DataSource.query.get(source_id)
         except SQLAlchemyError as e:
-            logger.error(f"Error retrieving data source by ID: {e}")
+            logger.error("Error retrieving data source by ID: %s", e)
             return None
 
-    def get_data_sources_by_type(self, source_type: str) -> List[DataSource]:
-        """Get all data sources of a specific type."""
+    def get_data_sources_by_type(
+        self, source_type: str, columns: Optional[Sequence[str]] = None
+    ) -> List[DataSource]:
+        """
+        Get all data sources of a specific type.
+
+        Args:
+            source_type: Type of source to filter by
+            columns: Optional column names to load (others are deferred)
+
+        Returns:
+            List of matching DataSource objects
+        """
         try:
-            return DataSource.query.filter_by(source_type=source_type).all()
+            query = DataSource.query.filter_by(source_type=source_type)
+            return _apply_load_only(query, DataSource, columns).all()
         except SQLAlchemyError as e:
-            logger.error(f"Error retrieving data sources by type: {e}")
+            logger.error("Error retrieving data sources by type: %s", e)
             return []
 
-    def get_data_sources_by_status(self, status: str) -> List[DataSource]:
-        """Get all data sources with a specific status."""
+    def get_data_sources_by_status(
+        self, status: str, columns: Optional[Sequence[str]] = None
+    ) -> List[DataSource]:
+        """
+        Get all data sources with a specific status.
+
+        Args:
+            status: Status to filter by
+            columns: Optional column names to load (others are deferred)
+
+        Returns:
+            List of matching DataSource objects
+        """
         try:
-            return DataSource.query.filter_by(status=status).all()
+            query = DataSource.query.filter_by(status=status)
+            return _apply_load_only(query, DataSource, columns).all()
         except SQLAlchemyError as e:
-            logger.error(f"Error retrieving data sources by status: {e}")
+            logger.error("Error retrieving data sources by status: %s", e)
             return []
 
+    def iter_data_sources_by_status(
+        self,
+        status: str,
+        columns: Optional[Sequence[str]] = None,
+        batch_size: int = 200,
+    ) -> Iterator[DataSource]:
+        """
+        Stream data sources with a specific status in batches.
+
+        Unlike get_data_sources_by_status, rows are fetched batch_size at a
+        time instead of being materialized into a single list.
+
+        Args:
+            status: Status to filter by
+            columns: Optional column names to load (others are deferred)
+            batch_size: Number of rows fetched per round-trip
+
+        Yields:
+            Matching DataSource objects
+        """
+        try:
+            query = DataSource.query.filter_by(status=status)
+            query = _apply_load_only(query, DataSource, columns)
+            yield from query.yield_per(batch_size)
+        except SQLAlchemyError as e:
+            logger.error("Error streaming data sources by status: %s", e)
+
     def update_data_source(self, source_id: int, **kwargs) -> Optional[DataSource]:
         """
         Update data source record.
@@ -520,9 +691,13 @@ class PersistenceManager:
                 "error_message",
                 "user_settings_id",
             }
+            invalid_keys = kwargs.keys() - valid_attributes
+            if invalid_keys:
+                logger.warning(
+                    "Invalid attributes in kwargs, skipping: %s", sorted(invalid_keys)
+                )
             for key, value in kwargs.items():
-                if key not in valid_attributes:
-                    logger.warning(f"Invalid attribute '{key}' in kwargs, skipping")
+                if key in invalid_keys:
                     continue
                 if hasattr(data_source, key):
                     setattr(data_source, key, value)
@@ -535,7 +710,7 @@ class PersistenceManager:
             return data_source
         except SQLAlchemyError as e:
             db.session.rollback()
-            logger.error(f"Error updating data source: {e}")
+            logger.error("Error updating data source: %s", e)
             return None
 
     def delete_data_source(self, source_id: int) -> bool:
@@ -550,7 +725,7 @@ class PersistenceManager:
             return True
         except SQLAlchemyError as e:
             db.session.rollback()
-            logger.error(f"Error deleting data source: {e}")
+            logger.error("Error deleting data source: %s", e)
             return False
 
     # Transcription CRUD operations
@@ -588,7 +763,7 @@ class PersistenceManager:
             return transcription
         except SQLAlchemyError as e:
             db.session.rollback()
-            logger.error(f"Error creating transcription: {e}")
+            logger.error("Error creating transcription: %s", e)
             return None
 
     def get_transcription_by_id(self, transcription_id: int) -> Optional[Transcription]:
@@ -596,15 +771,27 @@ class PersistenceManager:
         try:
             return Transcription.query.get(transcription_id)
         except SQLAlchemyError as e:
-            logger.error(f"Error retrieving transcription by ID: {e}")
+            logger.error("Error retrieving transcription by ID: %s", e)
             return None
 
-    def get_transcriptions_by_status(self, status: str) -> List[Transcription]:
-        """Get all transcriptions with a specific status."""
+    def get_transcriptions_by_status(
+        self, status: str, columns: Optional[Sequence[str]] = None
+    ) -> List[Transcription]:
+        """
+        Get all transcriptions with a specific status.
+
+        Args:
+            status: Status to filter by
+            columns: Optional column names to load (others are deferred)
+
+        Returns:
+            List of matching Transcription objects
+        """
         try:
-            return Transcription.query.filter_by(status=status).all()
+            query = Transcription.query.filter_by(status=status)
+            return _apply_load_only(query, Transcription, columns).all()
         except SQLAlchemyError as e:
-            logger.error(f"Error retrieving transcriptions by status: {e}")
+            logger.error("Error retrieving transcriptions by status: %s", e)
             return []
 
     def update_transcription(
@@ -640,9 +827,13 @@ class PersistenceManager:
                 "user_settings_id",
                 "chat_history_id",
             }
+            invalid_keys = kwargs.keys() - valid_attributes
+            if invalid_keys:
+                logger.warning(
+                    "Invalid attributes in kwargs, skipping: %s", sorted(invalid_keys)
+                )
             for key, value in kwargs.items():
-                if key not in valid_attributes:
-                    logger.warning(f"Invalid attribute '{key}' in kwargs, skipping")
+                if key in invalid_keys:
                     continue
                 if hasattr(transcription, key):
                     setattr(transcription, key, value)
@@ -655,7 +846,7 @@ class PersistenceManager:
             return transcription
         except SQLAlchemyError as e:
             db.session.rollback()
-            logger.error(f"Error updating transcription: {e}")
+            logger.error("Error updating transcription: %s", e)
             return None
 
     def delete_transcription(self, transcription_id: int) -> bool:
@@ -670,7 +861,7 @@ class PersistenceManager:
             return True
         except SQLAlchemyError as e:
             db.session.rollback()
-            logger.error(f"Error deleting transcription: {e}")
+            logger.error("Error deleting transcription: %s", e)
             return False
 
     # Utility methods
@@ -679,7 +870,7 @@ class PersistenceManager:
         try:
             return UserSettings.query.all()
         except SQLAlchemyError as e:
-            logger.error(f"Error retrieving all user settings: {e}")
+            logger.error("Error retrieving all user settings: %s", e)
             return []
 
     def get_recent_chat_history(self, limit: int = 50) -> List[ChatHistory]:
@@ -691,7 +882,31 @@ class PersistenceManager:
                 .all()
             )
         except SQLAlchemyError as e:
-            logger.error(f"Error retrieving recent chat history: {e}")
+            logger.error("Error retrieving recent chat history: %s", e)
+            return []
+
+    def list_recent_chat_history_rows(self, limit: int = 50) -> List[Dict[str, Any]]:
+        """
+        Get recent chat history across all sessions as plain dictionaries.
+
+        Read-only counterpart of get_recent_chat_history that skips ORM
+        instance construction, for callers that serialize the rows directly.
+
+        Args:
+            limit: Maximum number of rows to return
+
+        Returns:
+            List of row dictionaries, newest first
+        """
+        try:
+            stmt = (
+                select(*_CHAT_LIST_COLS)
+                .order_by(ChatHistory.timestamp.desc())
+                .limit(limit)
+            )
+            return [dict(row) for row in db.session.execute(stmt).mappings()]
+        except SQLAlchemyError as e:
+            logger.error("Error retrieving recent chat history rows: %s", e)
             return []
 
     def get_all_data_sources(self) -> List[DataSource]:
@@ -699,7 +914,7 @@ class PersistenceManager:
         try:
             return DataSource.query.all()
         except SQLAlchemyError as e:
-            logger.error(f"Error retrieving all data sources: {e}")
+            logger.error("Error retrieving all data sources: %s", e)
             return []
 
     def get_all_transcriptions(self) -> List[Transcription]:
@@ -707,5 +922,5 @@ class PersistenceManager:
         try:
             return Transcription.query.all()
         except SQLAlchemyError as e:
-            logger.error(f"Error retrieving all transcriptions: {e}")
+            logger.error("Error retrieving all transcriptions: %s", e)
             return []
@@ -2,18 +2,39 @@
 Whisper.cpp transcription service for audio-to-text conversion.
 
 This service provides functionality to transcribe audio files using the
-whisper.cpp executable as a subprocess.
+whisper.cpp executable as a subprocess, or in-process through the optional
+faster-whisper or pywhispercpp packages when they are installed.
 """
 
+import importlib.util
 import logging
+import os
 import subprocess
 import tempfile
+import threading
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, List, Optional
 
 # Configure logger
 logger = logging.getLogger(__name__)
 
+# Optional in-process backends, imported on first use when installed
+HAS_FASTER_WHISPER = importlib.util.find_spec("faster_whisper") is not None
+HAS_PYWHISPERCPP = importlib.util.find_spec("pywhispercpp") is not None
+
+
+def _decode_output(output: Optional[bytes]) -> str:
+    """
+    Decode captured subprocess output, replacing invalid UTF-8 bytes.
+
+    Args:
+        output: Raw bytes captured from a subprocess pipe.
+
+    Returns:
+        The decoded and stripped text.
+    """
+    return (output or b"").decode("utf-8", "replace").strip()
+
 
 class WhisperTranscriptionService:
     """
@@ -25,6 +46,7 @@ class WhisperTranscriptionService:
         whisper_executable: str = "whisper",
         default_model: str = "base",
         temp_dir: Optional[str] = None,
+        compute_type: Optional[str] = None,
     ):
         """
         Initialize the WhisperTranscriptionService.
@@ -33,28 +55,146 @@ class WhisperTranscriptionService:
             whisper_executable: Path to the whisper.cpp executable.
             default_model: Default whisper model to use for transcription.
             temp_dir: Directory for temporary files (uses system temp if None).
+            compute_type: faster-whisper compute type (defaults to the
+                WHISPER_COMPUTE_TYPE environment variable, then "int8").
         """
         self.whisper_executable = whisper_executable
         self.default_model = default_model
         self.temp_dir = Path(temp_dir) if temp_dir else Path(tempfile.gettempdir())
+        self.compute_type = compute_type or os.environ.get(
+            "WHISPER_COMPUTE_TYPE", "int8"
+        )
+
+        # Result of the last whisper.cpp availability check
+        self._whisper_available: Optional[bool] = None
+
+        # In-process whisper models, loaded once per model name
+        self._models: Dict[str, Any] = {}
+        self._model_lock = threading.Lock()
+
+    def _get_model(self, model_name: str) -> Optional[Any]:
+        """
+        Get a resident whisper model, loading it on first use.
+
+        faster-whisper is preferred over pywhispercpp when both are installed.
+
+        Args:
+            model_name: Whisper model name or path to a model file.
+
+        Returns:
+            The loaded model, or None if no in-process backend is installed.
+        """
+        if model_name in self._models:
+            return self._models[model_name]
+
+        if HAS_FASTER_WHISPER:
+            from faster_whisper import WhisperModel
+
+            logger.info(
+                f"Loading faster-whisper model {model_name} ({self.compute_type})"
+            )
+            model = WhisperModel(
+                model_name, device="auto", compute_type=self.compute_type
+            )
+        elif HAS_PYWHISPERCPP:
+            from pywhispercpp.model import Model as WhisperCppModel
+
+            logger.info(f"Loading whisper.cpp model {model_name}")
+            model = WhisperCppModel(model_name)
+        else:
+            return None
+
+        self._models[model_name] = model
+        return model
+
+    def preload_model(self, model: Optional[str] = None) -> bool:
+        """
+        Load the in-process whisper model before the first transcription.
+
+        Args:
+            model: Whisper model to load (defaults to default_model).
+
+        Returns:
+            True if a resident model is loaded, False if no in-process backend
+            is installed.
+        """
+        with self._model_lock:
+            return self._get_model(model or self.default_model) is not None
+
+    def _transcribe_in_process(self, model: Any, audio_path: Path) -> Optional[str]:
+        """
+        Transcribe an audio file with a resident whisper model.
+
+        Args:
+            model: Loaded faster-whisper or pywhispercpp model.
+            audio_path: Path to the audio file to transcribe.
+
+        Returns:
+            Transcribed text if any speech was found, None otherwise.
+        """
+        try:
+            if HAS_FASTER_WHISPER:
+                segments, _ = model.transcribe(
+                    str(audio_path), beam_size=1, vad_filter=True
+                )
+            else:
+                segments = model.transcribe(str(audio_path))
+
+            # faster-whisper decodes lazily, so join inside the error handling
+            transcribed_text = "\n".join(segment.text.strip() for segment in segments)
+        except Exception as e:
+            logger.error(
+                f"Unexpected error during transcription of {audio_path}: {e}",
+                exc_info=True,
+            )
+            raise RuntimeError(f"Transcription failed: {e}")
+
+        transcribed_text = transcribed_text.strip()
+        logger.info(
+            f"In-process transcription completed for {audio_path} "
+            f"({len(transcribed_text)} characters)"
+        )
+        return transcribed_text or None
 
     def is_whisper_available(self) -> bool:
         """
         Check if whisper.cpp executable is available.
 
+        The result is cached on the instance; call
+        invalidate_availability_cache() to check again.
+
         Returns:
             True if whisper.cpp is available, False otherwise.
         """
-        try:
-            result = subprocess.run(
-                [self.whisper_executable, "--help"],
-                capture_output=True,
-                text=True,
-                timeout=10,
+        if self._whisper_available is None:
+            try:
+                result = subprocess.run(
+                    [self.whisper_executable, "--help"],
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
+                    timeout=10,
+                )
+                self._whisper_available = result.returncode == 0
+            except (subprocess.TimeoutExpired, FileNotFoundError, OSError):
+                self._whisper_available = False
+        return self._whisper_available
+
+    def invalidate_availability_cache(self) -> None:
+        """Forget the cached whisper.cpp availability check result."""
+        self._whisper_available = None
+
+    def _ensure_whisper_available(self) -> None:
+        """
+        Raise if the whisper.cpp executable cannot be run.
+
+        Raises:
+            RuntimeError: If whisper.cpp is not available.
+        """
+        if not self.is_whisper_available():
+            executable = self.whisper_executable
+            raise RuntimeError(
+                f"whisper.cpp executable not found or not working: {executable}"
             )
-            return result.returncode == 0
-        except (subprocess.TimeoutExpired, FileNotFoundError, OSError):
-            return False
 
     def transcribe_audio(
         self, audio_file_path: str, model: Optional[str] = None
@@ -77,13 +217,16 @@ class WhisperTranscriptionService:
         if not audio_path.exists():
             raise FileNotFoundError(f"Audio file not found: {audio_file_path}")
 
-        if not self.is_whisper_available():
-            executable = self.whisper_executable
-            raise RuntimeError(
-                f"whisper.cpp executable not found or not working: {executable}"
-            )
-
         model_to_use = model or self.default_model
+
+        # Resident models are not thread-safe, so share one model at a time
+        with self._model_lock:
+            resident_model = self._get_model(model_to_use)
+            if resident_model is not None:
+                return self._transcribe_in_process(resident_model, audio_path)
+
+        self._ensure_whisper_available()
+
         logger.info(
             f"Starting transcription of {audio_file_path} using model {model_to_use}"
         )
@@ -110,24 +253,24 @@ class WhisperTranscriptionService:
             logger.debug(f"Running whisper.cpp command: {' '.join(cmd)}")
 
             # Run whisper.cpp subprocess
+            # The transcript is written to the output file, so only stderr is kept
             result = subprocess.run(
                 cmd,
-                capture_output=True,
-                text=True,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
                 timeout=300,  # 5 minute timeout
             )
 
             if result.returncode != 0:
+                stderr = _decode_output(result.stderr)
                 logger.error(f"whisper.cpp failed with return code {result.returncode}")
-                logger.error(f"stderr: {result.stderr}")
-                raise RuntimeError(f"whisper.cpp transcription failed: {result.stderr}")
+                logger.error(f"stderr: {stderr}")
+                raise RuntimeError(f"whisper.cpp transcription failed: {stderr}")
 
             # Read transcription result
             transcription_file = temp_output_path
             if transcription_file.exists() and transcription_file.stat().st_size > 0:
-                transcribed_text = transcription_file.read_text(
-                    encoding="utf-8"
-                ).strip()
+                transcribed_text = _decode_output(transcription_file.read_bytes())
                 logger.info(
                     f"Whisper.cpp transcription completed for {audio_file_path} "
                     f"({len(transcribed_text)} characters)"
@@ -138,9 +281,6 @@ class WhisperTranscriptionService:
                     f"Transcription completed but no output file found: "
                     f"{transcription_file}"
                 )
-                # Try to get text from stdout as fallback
-                if result.stdout.strip():
-                    return result.stdout.strip()
                 return None
 
         except subprocess.TimeoutExpired:
@@ -156,6 +296,93 @@ class WhisperTranscriptionService:
             # Clean up temporary files
             self._cleanup_temp_file(temp_output_path)
 
+    def transcribe_batch(
+        self, audio_file_paths: List[str], model: Optional[str] = None
+    ) -> List[Optional[str]]:
+        """
+        Transcribe several audio files, loading the whisper model only once.
+
+        With an in-process backend the resident model is shared across the
+        batch. Otherwise every file is passed to a single whisper.cpp run that
+        writes its transcripts into a temporary directory under temp_dir.
+
+        Args:
+            audio_file_paths: Paths to the audio files to transcribe.
+            model: Whisper model to use (defaults to default_model).
+
+        Returns:
+            Transcribed text for each file in input order, None for files that
+            produced no output.
+
+        Raises:
+            FileNotFoundError: If any audio file doesn't exist.
+            RuntimeError: If whisper.cpp is not available or transcription fails.
+        """
+        audio_paths = [Path(audio_file_path) for audio_file_path in audio_file_paths]
+        for audio_path in audio_paths:
+            if not audio_path.exists():
+                raise FileNotFoundError(f"Audio file not found: {audio_path}")
+
+        if not audio_paths:
+            return []
+
+        model_to_use = model or self.default_model
+
+        with self._model_lock:
+            resident_model = self._get_model(model_to_use)
+            if resident_model is not None:
+                return [
+                    self._transcribe_in_process(resident_model, audio_path)
+                    for audio_path in audio_paths
+                ]
+
+        self._ensure_whisper_available()
+
+        logger.info(
+            f"Starting batch transcription of {len(audio_paths)} files "
+            f"using model {model_to_use}"
+        )
+
+        # whisper.cpp writes <input>.txt next to each input, so run it on links
+        # in a private directory to keep its output away from the user's files
+        with tempfile.TemporaryDirectory(dir=self.temp_dir) as batch_dir:
+            input_paths = []
+            for index, audio_path in enumerate(audio_paths):
+                input_path = Path(batch_dir) / f"{index}{audio_path.suffix}"
+                os.symlink(audio_path.resolve(), input_path)
+                input_paths.append(input_path)
+
+            cmd = [self.whisper_executable, "-m", model_to_use, "-otxt"]
+            for input_path in input_paths:
+                cmd.extend(["-f", str(input_path)])
+
+            try:
+                # Transcripts are written to files, so only stderr is kept
+                result = subprocess.run(
+                    cmd,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.PIPE,
+                    timeout=300 * len(audio_paths),  # 5 minutes per file
+                )
+            except subprocess.TimeoutExpired:
+                logger.error("whisper.cpp batch transcription timed out")
+                raise RuntimeError("whisper.cpp transcription timed out")
+
+            if result.returncode != 0:
+                stderr = _decode_output(result.stderr)
+                logger.error(f"whisper.cpp failed with return code {result.returncode}")
+                logger.error(f"stderr: {stderr}")
+                raise RuntimeError(f"whisper.cpp transcription failed: {stderr}")
+
+            transcriptions = []
+            for input_path in input_paths:
+                output_path = Path(f"{input_path}.txt")
+                text = ""
+                if output_path.exists():
+                    text = _decode_output(output_path.read_bytes())
+                transcriptions.append(text or None)
+            return transcriptions
+
     def _cleanup_temp_file(self, file_path: Path) -> None:
         """
         Clean up a temporary file.
@@ -6,8 +6,9 @@ as MP3 files using yt-dlp's Python API.
 """
 
 import logging
+import os
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 from urllib.parse import urlparse
 
 import yt_dlp
@@ -15,6 +16,20 @@ import yt_dlp
 # Configure logger
 logger = logging.getLogger(__name__)
 
+# Hosts that serve YouTube videos
+YOUTUBE_HOSTS = frozenset(
+    {
+        "youtube.com",
+        "www.youtube.com",
+        "m.youtube.com",
+        "youtu.be",
+        "music.youtube.com",
+    }
+)
+
+# Fragments of a single video fetched in parallel during batch downloads
+BATCH_CONCURRENT_FRAGMENTS = 4
+
 
 class YouTubeDownloaderService:
     """
@@ -31,6 +46,7 @@ class YouTubeDownloaderService:
         self.download_directory = Path(download_directory)
         self.download_directory.mkdir(parents=True, exist_ok=True)
         self.downloaded_file_path = None  # Track the last downloaded file
+        self.downloaded_file_paths = []  # Every file finished in the current run
 
     def is_youtube_url(self, url: str) -> bool:
         """
@@ -43,13 +59,7 @@ class YouTubeDownloaderService:
             True if the URL is a YouTube URL, False otherwise.
         """
         try:
-            parsed = urlparse(url)
-            return parsed.netloc.lower() in [
-                "youtube.com",
-                "www.youtube.com",
-                "youtu.be",
-                "music.youtube.com",
-            ]
+            return urlparse(url).netloc.lower() in YOUTUBE_HOSTS
         except Exception:
             return False
 
@@ -74,29 +84,11 @@ class YouTubeDownloaderService:
 
         # Reset the downloaded file tracker
         self.downloaded_file_path = None
+        self.downloaded_file_paths = []
 
-        # Configure yt-dlp options
-        output_template = str(self.download_directory / "%(title)s.%(ext)s")
-        ydl_opts = {
-            "format": "bestaudio/best",
-            "postprocessors": [
-                {
-                    "key": "FFmpegExtractAudio",
-                    "preferredcodec": "mp3",
-                    "preferredquality": "192",
-                }
-            ],
-            "outtmpl": output_template,
-            "noplaylist": True,
-            "restrictfilenames": True,
-            "quiet": True,  # Reduce verbose output
-            "no_warnings": False,
-        }
+        ydl_opts = self._build_ydl_opts()
 
         try:
-            # Add progress hook to track downloaded file
-            ydl_opts["postprocessor_hooks"] = [self._postprocessor_hook]
-
             with yt_dlp.YoutubeDL(ydl_opts) as ydl:
                 # Download the audio
                 ydl.download([youtube_url])
@@ -124,6 +116,77 @@ class YouTubeDownloaderService:
             logger.error(f"Unexpected error during download: {e}", exc_info=True)
             raise RuntimeError(f"Unexpected error during download: {e}")
 
+    def download_audios(self, youtube_urls: List[str]) -> List[str]:
+        """
+        Download audio from several YouTube URLs in a single yt-dlp session.
+
+        One YoutubeDL instance is shared by every URL, so extractor setup is
+        paid once, and each video's fragments are fetched concurrently.
+
+        Args:
+            youtube_urls: The YouTube URLs to download audio from.
+
+        Returns:
+            Paths to the downloaded MP3 files, in the order they finished.
+
+        Raises:
+            ValueError: If any URL is not a valid YouTube URL.
+            RuntimeError: If yt-dlp download fails.
+        """
+        for youtube_url in youtube_urls:
+            if not self.is_youtube_url(youtube_url):
+                raise ValueError(f"Invalid YouTube URL: {youtube_url}")
+
+        logger.info(f"Starting audio download of {len(youtube_urls)} URLs")
+
+        self.downloaded_file_path = None
+        self.downloaded_file_paths = []
+
+        ydl_opts = self._build_ydl_opts()
+        ydl_opts["concurrent_fragment_downloads"] = BATCH_CONCURRENT_FRAGMENTS
+
+        try:
+            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+                ydl.download(list(youtube_urls))
+        except yt_dlp.utils.DownloadError as e:
+            logger.error(f"yt-dlp download failed: {e}")
+            raise RuntimeError(f"yt-dlp download failed: {e}")
+        except Exception as e:
+            logger.error(f"Unexpected error during download: {e}", exc_info=True)
+            raise RuntimeError(f"Unexpected error during download: {e}")
+
+        downloaded_files = [
+            str(path) for path in self.downloaded_file_paths if path.exists()
+        ]
+        logger.info(f"Downloaded {len(downloaded_files)} audio files")
+        return downloaded_files
+
+    def _build_ydl_opts(self) -> dict:
+        """
+        Build the yt-dlp options shared by single and batch downloads.
+
+        Returns:
+            Options dictionary for yt_dlp.YoutubeDL.
+        """
+        output_template = str(self.download_directory / "%(title)s.%(ext)s")
+        return {
+            "format": "bestaudio/best",
+            "postprocessors": [
+                {
+                    "key": "FFmpegExtractAudio",
+                    "preferredcodec": "mp3",
+                    "preferredquality": "192",
+                }
+            ],
+            "outtmpl": output_template,
+            "noplaylist": True,
+            "restrictfilenames": True,
+            "quiet": True,  # Reduce verbose output
+            "no_warnings": False,
+            # Track downloaded files as post-processing finishes
+            "postprocessor_hooks": [self._postprocessor_hook],
+        }
+
     def _postprocessor_hook(self, d):
         """
         Hook called by yt-dlp after post-processing (audio extraction).
@@ -133,6 +196,8 @@ class YouTubeDownloaderService:
         """
         if d["status"] == "finished":
             self.downloaded_file_path = Path(d["filepath"])
+            if self.downloaded_file_path not in self.downloaded_file_paths:
+                self.downloaded_file_paths.append(self.downloaded_file_path)
             logger.debug(f"Post-processing finished: {self.downloaded_file_path}")
 
     def _find_newest_mp3_file(self) -> Optional[Path]:
@@ -142,9 +207,16 @@ class YouTubeDownloaderService:
         Returns:
             Path to the newest MP3 file if found, None otherwise.
         """
-        mp3_files = list(self.download_directory.glob("*.mp3"))
-        if mp3_files:
-            return max(mp3_files, key=lambda f: f.stat().st_mtime)
+        # DirEntry.stat() results are cached, so each file is stat'ed only once
+        with os.scandir(self.download_directory) as entries:
+            mp3_entries = [
+                entry
+                for entry in entries
+                if entry.name.endswith(".mp3") and entry.is_file()
+            ]
+        if mp3_entries:
+            newest = max(mp3_entries, key=lambda entry: entry.stat().st_mtime)
+            return Path(newest.path)
         return None
 
     def cleanup_file(self, file_path: str) -> bool:
@@ -158,14 +230,12 @@ class YouTubeDownloaderService:
             True if cleanup was successful, False otherwise.
         """
         try:
-            path = Path(file_path)
-            if path.exists():
-                path.unlink()
-                logger.info(f"Cleaned up file: {file_path}")
-                return True
-            else:
-                logger.warning(f"File not found for cleanup: {file_path}")
-                return False
+            os.remove(file_path)
+            logger.info(f"Cleaned up file: {file_path}")
+            return True
+        except FileNotFoundError:
+            logger.warning(f"File not found for cleanup: {file_path}")
+            return False
         except Exception as e:
             logger.error(f"Error cleaning up file {file_path}: {e}", exc_info=True)
             return False
@@ -11,16 +11,17 @@ import sys
 import tempfile
 from pathlib import Path
 
-# Add the current directory to the Python path  # noqa: E402
+# Add the current directory to the Python path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from app.services.whisper_transcription_service import (  # noqa: E402
-    WhisperTranscriptionService,
-)
-
 
 def demonstrate_whisper_service():
     """Demonstrate the WhisperTranscriptionService functionality."""
+    # Imported here so only the demonstration pays for loading the service
+    from app.services.whisper_transcription_service import (
+        WhisperTranscriptionService,
+    )
+
     print("=" * 60)
     print("Whisper.cpp Integration Demonstration")
     print("=" * 60)
@@ -136,7 +137,13 @@ def demonstrate_youtube_integration():
     print("   - content_type: 'audio/mp3'")
 
 
-if __name__ == "__main__":
+def main():
+    """
+    Run the whisper integration demonstration.
+
+    Returns:
+        int: Process exit code (0 on success, 1 on error)
+    """
     # Set up logging
     logging.basicConfig(level=logging.INFO)
 
@@ -147,7 +154,12 @@ if __name__ == "__main__":
         print("\n" + "🎉" * 20)
         print("Whisper.cpp integration successfully implemented!")
         print("🎉" * 20)
+        return 0
 
     except Exception as e:
         print(f"\nError during demonstration: {e}")
-        sys.exit(1)
+        return 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -3,11 +3,12 @@
 Utility script to generate an encryption key for the RAG chatbot.
 """
 
-from cryptography.fernet import Fernet
-
 
 def main():
     """Generate and display a new encryption key."""
+    # Imported here so the script starts without loading cryptography up front
+    from cryptography.fernet import Fernet
+
     print("RAG Chatbot - Encryption Key Generator")
     print("=" * 40)
 
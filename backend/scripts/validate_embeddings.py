@@ -4,12 +4,54 @@ Tests the basic structure and logic without requiring external dependencies.
 """
 
 import os
+import re
 import sys
 
+# tomllib ships with Python 3.11+; 3.10 falls back to a substring scan
+if sys.version_info >= (3, 11):
+    import tomllib
+else:
+    tomllib = None
+
 # Add the backend root directory to the Python path
 backend_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 sys.path.insert(0, backend_root)
 
+# Leading distribution name of a PEP 508 requirement string
+_REQUIREMENT_NAME = re.compile(r"[A-Za-z0-9][A-Za-z0-9._-]*")
+
+
+def _missing_tokens(content, tokens):
+    """
+    Find which tokens do not occur in the given text, scanning it only once.
+
+    Args:
+        content: Text to search
+        tokens: Strings that must all appear in the text
+
+    Returns:
+        list: Tokens that were not found, in their original order
+    """
+    # Longest first, so a token is not shadowed by a shorter token it starts with
+    ordered = sorted(tokens, key=len, reverse=True)
+    found = set(re.findall("|".join(map(re.escape, ordered)), content))
+    return [token for token in tokens if token not in found]
+
+
+def _missing_attributes(obj, names):
+    """
+    Find which attribute names an object does not define.
+
+    Args:
+        obj: Module or class to inspect
+        names: Attribute names that must all be present
+
+    Returns:
+        list: Names that are missing, in their original order
+    """
+    available = set(dir(obj))
+    return [name for name in names if name not in available]
+
 
 def test_config_structure():
     """Test that config.py has the required embedding configuration."""
@@ -27,11 +69,11 @@ def test_config_structure():
             "HUGGINGFACE_API_TOKEN",
         ]
 
-        for attr in required_attrs:
-            if not hasattr(Config, attr):
-                print(f"✗ Missing required config attribute: {attr}")
-                return False
-            print(f"✓ Found config attribute: {attr}")
+        missing_attrs = _missing_attributes(Config, required_attrs)
+        if missing_attrs:
+            print(f"✗ Missing required config attributes: {', '.join(missing_attrs)}")
+            return False
+        print(f"✓ Found config attributes: {', '.join(required_attrs)}")
 
         print("✓ Config structure test passed!")
         return True
@@ -59,11 +101,11 @@ def test_embeddings_structure():
             "create_embedding_function",
         ]
 
-        for item in required_items:
-            if not hasattr(embeddings, item):
-                print(f"✗ Missing required item: {item}")
-                return False
-            print(f"✓ Found item: {item}")
+        missing_items = _missing_attributes(embeddings, required_items)
+        if missing_items:
+            print(f"✗ Missing required items: {', '.join(missing_items)}")
+            return False
+        print(f"✓ Found items: {', '.join(required_items)}")
 
         # Check EmbeddingFactory class structure
         factory = embeddings.EmbeddingFactory
@@ -73,11 +115,11 @@ def test_embeddings_structure():
             "_create_openai_embedding",
         ]
 
-        for method in required_methods:
-            if not hasattr(factory, method):
-                print(f"✗ Missing required method: {method}")
-                return False
-            print(f"✓ Found method: {method}")
+        missing_methods = _missing_attributes(factory, required_methods)
+        if missing_methods:
+            print(f"✗ Missing required methods: {', '.join(missing_methods)}")
+            return False
+        print(f"✓ Found methods: {', '.join(required_methods)}")
 
         # Check supported providers
         if not hasattr(factory, "SUPPORTED_PROVIDERS"):
@@ -120,11 +162,11 @@ def test_env_example_updated():
             "HUGGINGFACE_API_TOKEN",
         ]
 
-        for var in required_vars:
-            if var not in content:
-                print(f"✗ Missing environment variable: {var}")
-                return False
-            print(f"✓ Found environment variable: {var}")
+        missing_vars = _missing_tokens(content, required_vars)
+        if missing_vars:
+            print(f"✗ Missing environment variables: {', '.join(missing_vars)}")
+            return False
+        print(f"✓ Found environment variables: {', '.join(required_vars)}")
 
         print("✓ Environment example test passed!")
         return True
@@ -144,9 +186,6 @@ def test_pyproject_dependencies():
             print("✗ pyproject.toml file not found")
             return False
 
-        with open(pyproject_path, "r") as f:
-            content = f.read()
-
         required_deps = [
             "langchain",
             "langchain-community",
@@ -154,11 +193,23 @@ def test_pyproject_dependencies():
             "langchain-huggingface",
         ]
 
-        for dep in required_deps:
-            if dep not in content:
-                print(f"✗ Missing dependency: {dep}")
-                return False
-            print(f"✓ Found dependency: {dep}")
+        if tomllib is not None:
+            with open(pyproject_path, "rb") as f:
+                data = tomllib.load(f)
+            declared = {
+                _REQUIREMENT_NAME.match(dep).group(0).lower().replace("_", "-")
+                for dep in data.get("project", {}).get("dependencies", [])
+            }
+            missing_deps = [dep for dep in required_deps if dep not in declared]
+        else:
+            with open(pyproject_path, "r") as f:
+                content = f.read()
+            missing_deps = _missing_tokens(content, required_deps)
+
+        if missing_deps:
+            print(f"✗ Missing dependencies: {', '.join(missing_deps)}")
+            return False
+        print(f"✓ Found dependencies: {', '.join(required_deps)}")
 
         print("✓ Dependencies test passed!")
         return True
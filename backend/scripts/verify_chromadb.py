@@ -8,8 +8,9 @@ Usage:
     python verify_chromadb.py
 """
 
+import importlib.metadata
+import importlib.util
 import os
-import shutil
 import sys
 import tempfile
 import traceback
@@ -18,30 +19,48 @@ import traceback
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))  # noqa: E402
 
 
-def verify_chromadb_installation():
-    """Verify that ChromaDB can be imported."""
+def _installed_version(module_name, distribution_name):
+    """
+    Look up an installed package's version without importing it.
+
+    Args:
+        module_name: Top-level module name to locate
+        distribution_name: Distribution name to read the version from
+
+    Returns:
+        str: The installed version, or None if the module cannot be found
+    """
+    if importlib.util.find_spec(module_name) is None:
+        return None
+
     try:
-        import chromadb
+        return importlib.metadata.version(distribution_name)
+    except importlib.metadata.PackageNotFoundError:
+        return "unknown"
+
 
-        print(f"✓ ChromaDB version {chromadb.__version__} is available")
-        return True
-    except ImportError:
+def verify_chromadb_installation():
+    """Verify that ChromaDB is installed, without paying for its import."""
+    version = _installed_version("chromadb", "chromadb")
+    if version is None:
         print("❌ ChromaDB is not installed")
         print("   Install with: pip install chromadb")
         return False
 
+    print(f"✓ ChromaDB version {version} is available")
+    return True
+
 
 def verify_flask_dependencies():
     """Verify Flask dependencies are available."""
-    try:
-        import flask
-
-        print(f"✓ Flask version {flask.__version__} is available")
-        return True
-    except ImportError:
+    version = _installed_version("flask", "flask")
+    if version is None:
         print("❌ Flask is not installed")
         return False
 
+    print(f"✓ Flask version {version} is available")
+    return True
+
 
 def run_chromadb_integration_test():
     """Run the full ChromaDB integration test."""
@@ -82,47 +101,46 @@ def run_chromadb_integration_test():
 def test_flask_integration():
     """Test the Flask integration example."""
     try:
-        temp_dir = tempfile.mkdtemp()
-
-        # Set up Flask app with ChromaDB
-        os.environ["CHROMADB_PERSIST_PATH"] = os.path.join(temp_dir, "test_chroma")
-
-        from chromadb_example import create_app_with_chromadb
-
-        app = create_app_with_chromadb()
-
-        with app.test_client() as client:
-            # Test status endpoint
-            response = client.get("/api/chromadb/status")
-            assert response.status_code == 200
-            data = response.get_json()
-            assert data["status"] == "healthy"
-            print("✓ Flask integration: Status endpoint works")
-
-            # Test collection creation
-            response = client.post("/api/chromadb/collections/test_collection")
-            assert response.status_code == 200
-            print("✓ Flask integration: Collection creation works")
-
-            # Test document addition
-            response = client.post(
-                "/api/chromadb/collections/test_collection/documents",
-                json={"documents": ["Test document about AI"], "ids": ["test_doc_1"]},
-            )
-            assert response.status_code == 200
-            print("✓ Flask integration: Document addition works")
-
-            # Test search
-            response = client.post(
-                "/api/chromadb/collections/test_collection/search",
-                json={"query": "artificial intelligence"},
-            )
-            assert response.status_code == 200
-            print("✓ Flask integration: Document search works")
-
-        # Clean up
-        if os.path.exists(temp_dir):
-            shutil.rmtree(temp_dir)
+        # The directory is removed on exit, even if an assertion below fails
+        with tempfile.TemporaryDirectory() as temp_dir:
+            # Set up Flask app with ChromaDB
+            os.environ["CHROMADB_PERSIST_PATH"] = os.path.join(temp_dir, "test_chroma")
+
+            from chromadb_example import create_app_with_chromadb
+
+            app = create_app_with_chromadb()
+
+            with app.test_client() as client:
+                # Test status endpoint
+                response = client.get("/api/chromadb/status")
+                assert response.status_code == 200
+                data = response.get_json()
+                assert data["status"] == "healthy"
+                print("✓ Flask integration: Status endpoint works")
+
+                # Test collection creation
+                response = client.post("/api/chromadb/collections/test_collection")
+                assert response.status_code == 200
+                print("✓ Flask integration: Collection creation works")
+
+                # Test document addition
+                response = client.post(
+                    "/api/chromadb/collections/test_collection/documents",
+                    json={
+                        "documents": ["Test document about AI"],
+                        "ids": ["test_doc_1"],
+                    },
+                )
+                assert response.status_code == 200
+                print("✓ Flask integration: Document addition works")
+
+                # Test search
+                response = client.post(
+                    "/api/chromadb/collections/test_collection/search",
+                    json={"query": "artificial intelligence"},
+                )
+                assert response.status_code == 200
+                print("✓ Flask integration: Document search works")
 
         print("✓ Flask integration test completed successfully")
 
@@ -0,0 +1,315 @@
+"""
+Shared pytest fixtures for the backend test suite.
+"""
+
+import importlib.machinery
+import os
+import sqlite3
+import sys
+import types
+from contextlib import contextmanager
+from unittest.mock import MagicMock, create_autospec
+
+import pytest
+from cryptography.fernet import Fernet
+from flask import Flask, current_app
+from sqlalchemy import event
+from sqlalchemy.orm import scoped_session, sessionmaker
+
+from app.config.config import config
+from app.main import create_app
+from app.models.models import db
+from app.services.chromadb_service import ChromaDBService
+from app.services.data_ingestion_service import DataIngestionService
+
+_PDF_TEXT = b"Test PDF document for RAG chatbot processing."
+
+# Minimal single-page PDF, built once at import time
+_PDF_BYTES = b"""%%PDF-1.4
+1 0 obj
+<<
+/Type /Catalog
+/Pages 2 0 R
+>>
+endobj
+
+2 0 obj
+<<
+/Type /Pages
+/Kids [3 0 R]
+/Count 1
+>>
+endobj
+
+3 0 obj
+<<
+/Type /Page
+/Parent 2 0 R
+/MediaBox [0 0 612 792]
+/Contents 4 0 R
+>>
+endobj
+
+4 0 obj
+<<
+/Length %d
+>>
+stream
+BT
+/F1 12 Tf
+100 700 Td
+(%s) Tj
+ET
+endstream
+endobj
+
+xref
+0 5
+0000000000 65535 f
+0000000009 00000 n
+0000000058 00000 n
+0000000115 00000 n
+0000000206 00000 n
+trailer
+<<
+/Size 5
+/Root 1 0 R
+>>
+startxref
+299
+%%%%EOF""" % (
+    len(_PDF_TEXT) + 20,
+    _PDF_TEXT,
+)
+
+# Shared by every test that needs a stand-in embedding model; reset between
+# tests instead of paying MagicMock construction each time
+_MOCK_EMBEDDING = MagicMock()
+
+
+def _stubbed_module_getattr(name):
+    raise RuntimeError(
+        "sentence_transformers is stubbed in tests; "
+        "patch HuggingFaceEmbeddings instead of loading a real model"
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    """
+    Pin integration tests to a single xdist group.
+
+    Under ``--dist loadgroup`` they then share one worker, and with it one
+    ChromaDB client, while the cheap unit tests spread across the rest.
+    """
+    for item in items:
+        if item.get_closest_marker("integration"):
+            item.add_marker(pytest.mark.xdist_group("integration"))
+
+
+@pytest.fixture(autouse=True, scope="session")
+def _stub_heavy_deps():
+    """
+    Stub sentence_transformers so no test can load a real embedding model.
+
+    Tests patch HuggingFaceEmbeddings; without the stub a missing patch would
+    silently import torch and download a model. torch itself is left alone
+    because chromadb and tokenizers probe for it.
+    """
+    if "sentence_transformers" in sys.modules:
+        yield
+        return
+
+    stub = types.ModuleType("sentence_transformers")
+    stub.__spec__ = importlib.machinery.ModuleSpec("sentence_transformers", None)
+    stub.__getattr__ = _stubbed_module_getattr
+    sys.modules["sentence_transformers"] = stub
+    try:
+        yield
+    finally:
+        sys.modules.pop("sentence_transformers", None)
+
+
+@pytest.fixture(scope="session")
+def encryption_key():
+    """Generate one Fernet key for the whole test session."""
+    return Fernet.generate_key().decode()
+
+
+@pytest.fixture(scope="session")
+def app(encryption_key):
+    """Create the Flask application once for the whole test session."""
+    app = create_app("testing")
+    app.config["ENCRYPTION_KEY"] = encryption_key
+    return app
+
+
+@pytest.fixture
+def client(app):
+    """Create a test client with empty database tables."""
+    with app.app_context():
+        for table in reversed(db.metadata.sorted_tables):
+            db.session.execute(table.delete())
+        db.session.commit()
+
+    with app.test_client() as client:
+        yield client
+
+
+def _begin_sqlite_transaction(conn):
+    conn.exec_driver_sql("BEGIN")
+
+
+@pytest.fixture
+def db_session(app):
+    """
+    Run a test on empty tables inside a transaction rolled back afterwards.
+
+    Commits made by the code under test only release a SAVEPOINT, so rows
+    never leak between tests while the app and schema stay cached.
+    """
+    with app.app_context():
+        engine = db.engine
+        # pysqlite defers BEGIN until the first write, so a SAVEPOINT would
+        # open the outer transaction and RELEASE would commit it. Hand
+        # transaction control to SQLAlchemy so the savepoints nest properly.
+        # Both changes are undone on teardown so tests using ``client`` keep
+        # the driver's default transaction handling.
+        event.listen(engine, "begin", _begin_sqlite_transaction)
+        connection = engine.connect()
+        driver_connection = connection.connection.driver_connection
+        original_isolation_level = driver_connection.isolation_level
+        driver_connection.isolation_level = None
+        transaction = connection.begin()
+
+        # Start from empty tables; the deletes are rolled back with the rest
+        for table in reversed(db.metadata.sorted_tables):
+            connection.execute(table.delete())
+
+        # A plain Session honours ``bind``; Flask-SQLAlchemy's would route
+        # every model back to the engine and bypass the outer transaction.
+        original_session = db.session
+        db.session = scoped_session(
+            sessionmaker(
+                bind=connection,
+                join_transaction_mode="create_savepoint",
+                query_cls=db.Query,
+            )
+        )
+        try:
+            yield db.session
+        finally:
+            db.session.remove()
+            db.session = original_session
+            transaction.rollback()
+            driver_connection.isolation_level = original_isolation_level
+            connection.close()
+            event.remove(engine, "begin", _begin_sqlite_transaction)
+
+
+# Emitted by db_session's savepoints rather than by the code under test
+_TRANSACTION_CONTROL_PREFIXES = ("BEGIN", "SAVEPOINT", "RELEASE", "ROLLBACK")
+
+
+@contextmanager
+def _count_queries(engine):
+    """Count SQL statements executed on an engine inside the block."""
+    statements = []
+
+    def _after_cursor_execute(conn, cursor, statement, *args):
+        if not statement.lstrip().upper().startswith(_TRANSACTION_CONTROL_PREFIXES):
+            statements.append(statement)
+
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+@pytest.fixture(scope="session")
+def count_queries():
+    """
+    Provide a context manager that records executed SQL statements.
+
+    Usage mirrors Django's ``assertNumQueries``::
+
+        with count_queries(db.engine) as queries:
+            client.get("/api/history")
+        assert len(queries) <= 1
+    """
+    return _count_queries
+
+
+def _tune_sqlite_for_tests(service):
+    """
+    Switch a ChromaDB service's SQLite file to WAL with relaxed durability.
+
+    Only safe for throwaway test databases. ChromaDB's own connections live
+    inside its Rust bindings, so only the file-level journal mode persists
+    beyond this connection; EXCLUSIVE locking is skipped since it would lock
+    ChromaDB out of its own database.
+    """
+    client = service._get_client()
+    persist_path = current_app.config.get("CHROMADB_PERSIST_PATH", "db/chroma")
+
+    connection = sqlite3.connect(os.path.join(persist_path, "chroma.sqlite3"))
+    try:
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=OFF")
+        connection.execute("PRAGMA temp_store=MEMORY")
+    finally:
+        connection.close()
+
+    return client
+
+
+@pytest.fixture
+def mock_embedding():
+    """Provide a reusable embedding model mock, reset after each test."""
+    yield _MOCK_EMBEDDING
+    _MOCK_EMBEDDING.reset_mock()
+
+
+@pytest.fixture
+def mock_data_ingestion_service(monkeypatch):
+    """Replace the routes' DataIngestionService with a spec'd mock."""
+    mock_service = create_autospec(DataIngestionService, instance=True)
+    monkeypatch.setattr("app.api.routes.data_ingestion_service", mock_service)
+    return mock_service
+
+
+@pytest.fixture(scope="session")
+def sample_pdf():
+    """Return the sample PDF bytes, shared by the whole session."""
+    return _PDF_BYTES
+
+
+@pytest.fixture(scope="session")
+def sample_pdf_path(tmp_path_factory):
+    """Write the sample PDF once per session and return its path."""
+    pdf_path = tmp_path_factory.mktemp("pdfs") / "sample.pdf"
+    pdf_path.write_bytes(_PDF_BYTES)
+    return str(pdf_path)
+
+
+@pytest.fixture(scope="session")
+def chroma_service(request, tmp_path_factory):
+    """
+    Create one ChromaDB service backed by a temporary directory per session.
+
+    Each pytest-xdist worker gets its own directory so workers never contend
+    for the same SQLite lock. Tests should use unique collection names to
+    stay isolated.
+    """
+    worker_id = getattr(request.config, "workerinput", {}).get("workerid", "gw0")
+    persist_path = tmp_path_factory.mktemp(f"chroma_{worker_id}")
+
+    app = Flask(__name__)
+    app.config.from_object(config["testing"])
+    app.config["CHROMADB_PERSIST_PATH"] = str(persist_path)
+
+    with app.app_context():
+        service = ChromaDBService()
+        _tune_sqlite_for_tests(service)
+
+    return service
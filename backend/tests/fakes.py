@@ -0,0 +1,119 @@
+"""
+In-memory fakes for external services used in unit tests.
+"""
+
+from typing import Any, Dict, List, Optional
+
+
+class FakeCollection:
+    """
+    Minimal in-memory stand-in for a ChromaDB collection.
+
+    Stores documents in a dict keyed by ID and answers queries with a linear
+    scan in insertion order, so no HNSW index or SQLite file is involved.
+    Only equality ``where`` filters are supported.
+    """
+
+    def __init__(self, name: str = "fake_collection"):
+        self.name = name
+        self._store: Dict[str, tuple] = {}
+
+    def add(
+        self,
+        ids: List[str],
+        documents: Optional[List[str]] = None,
+        metadatas: Optional[List[Dict[str, Any]]] = None,
+        embeddings: Optional[List[List[float]]] = None,
+    ) -> None:
+        documents = documents if documents is not None else [None] * len(ids)
+        metadatas = metadatas if metadatas is not None else [None] * len(ids)
+        if not len(ids) == len(documents) == len(metadatas):
+            raise ValueError("ids, documents and metadatas must have equal length")
+
+        self._store.update(zip(ids, zip(documents, metadatas)))
+
+    def count(self) -> int:
+        return len(self._store)
+
+    def get(
+        self,
+        ids: Optional[List[str]] = None,
+        include: Optional[List[str]] = None,
+    ) -> Dict[str, List[Any]]:
+        found = [doc_id for doc_id in (ids or self._store) if doc_id in self._store]
+        return {"ids": found}
+
+    def query(
+        self,
+        query_texts: Optional[List[str]] = None,
+        query_embeddings: Optional[List[List[float]]] = None,
+        n_results: int = 10,
+        where: Optional[Dict[str, Any]] = None,
+        where_document: Optional[Dict[str, Any]] = None,
+        include: Optional[List[str]] = None,
+    ) -> Dict[str, List[List[Any]]]:
+        queries = query_texts if query_texts is not None else query_embeddings
+        matches = [
+            doc_id
+            for doc_id, (_, metadata) in self._store.items()
+            if not where
+            or all((metadata or {}).get(key) == value for key, value in where.items())
+        ][:n_results]
+
+        return {
+            "ids": [list(matches) for _ in queries],
+            "documents": [[self._store[i][0] for i in matches] for _ in queries],
+            "metadatas": [[self._store[i][1] for i in matches] for _ in queries],
+        }
+
+
+class FakeChromaDBService:
+    """
+    Stand-in for ChromaDBService that records add_documents calls.
+
+    Each call's arguments are appended to ``calls`` as a dict, so tests can
+    check what would have been stored without building a spec'd mock.
+    """
+
+    def __init__(self):
+        self.calls: List[Dict[str, Any]] = []
+
+    def add_documents(
+        self,
+        collection_name: str,
+        documents: List[str],
+        metadatas: Optional[List[Dict[str, Any]]] = None,
+        ids: Optional[List[str]] = None,
+        embeddings: Optional[List[List[float]]] = None,
+        batch_size: Optional[int] = None,
+    ) -> bool:
+        self.calls.append(
+            {
+                "collection_name": collection_name,
+                "documents": documents,
+                "metadatas": metadatas,
+                "ids": ids,
+                "embeddings": embeddings,
+            }
+        )
+        return True
+
+
+class FakeEmbeddingModel:
+    """Embedding model returning a constant vector for every text."""
+
+    def __init__(self, dimension: int = 3):
+        self.dimension = dimension
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [[0.1] * self.dimension for _ in texts]
+
+
+class FakeEmbeddingFactory:
+    """Stand-in for EmbeddingFactory that always returns one fake model."""
+
+    def __init__(self, model: Optional[FakeEmbeddingModel] = None):
+        self.model = model or FakeEmbeddingModel()
+
+    def create_embedding_model(self, *args: Any, **kwargs: Any) -> FakeEmbeddingModel:
+        return self.model
@@ -1,128 +1,179 @@
 """
-Test script for ChromaDB service.
-This script tests the basic functionality of the ChromaDB service.
+Unit tests for the ChromaDB service with the Chroma client mocked out.
+
+Tests against a real persistent client live in test_chromadb_integration.py.
 """
 
-import os
-import shutil
-import sys
-import tempfile
-import traceback
+from unittest.mock import MagicMock, patch
 
+import pytest
+from chromadb import Collection
+from chromadb.errors import NotFoundError
 from flask import Flask
 
 from app.config.config import config
 from app.services.chromadb_service import ChromaDBService
+from tests.fakes import FakeCollection
+
+
+@pytest.fixture
+def mock_client():
+    """Patch PersistentClient so no SQLite or HNSW index is created."""
+    with patch(
+        "app.services.chromadb_service.chromadb.PersistentClient"
+    ) as persistent_client:
+        client = persistent_client.return_value
+        client.get_collection.side_effect = NotFoundError("missing")
+        client.create_collection.side_effect = lambda name, **kwargs: (
+            FakeCollection(name)
+        )
+        yield client
+
+
+@pytest.fixture
+def service(mock_client, tmp_path):
+    """Create a ChromaDBService inside an application context."""
+    app = Flask(__name__)
+    app.config.from_object(config["testing"])
+    app.config["CHROMADB_PERSIST_PATH"] = str(tmp_path)
+
+    with app.app_context():
+        yield ChromaDBService()
+
+
+def test_get_or_create_collection_creates_and_caches(service, mock_client):
+    """Test that a missing collection is created once and then cached."""
+    first = service.get_or_create_collection("test_collection")
+    second = service.get_or_create_collection("test_collection")
+
+    assert first is second
+    mock_client.create_collection.assert_called_once_with(
+        name="test_collection", metadata=None, embedding_function=None
+    )
+
+
+def test_get_or_create_collection_returns_existing(service, mock_client):
+    """Test that an existing collection is retrieved instead of created."""
+    existing = MagicMock(spec=Collection)
+    mock_client.get_collection.side_effect = None
+    mock_client.get_collection.return_value = existing
+
+    assert service.get_or_create_collection("test_collection") is existing
+    mock_client.create_collection.assert_not_called()
+
+
+def test_list_collections(service, mock_client):
+    """Test that collection names are returned."""
+    collection = MagicMock(spec=Collection)
+    collection.name = "test_collection"
+    mock_client.list_collections.return_value = [collection]
+
+    assert service.list_collections() == ["test_collection"]
+
+
+def test_add_documents(service):
+    """Test that added documents are stored under generated IDs."""
+    assert service.add_documents("test_collection", ["first", "second"])
+
+    assert service.get_collection_count("test_collection") == 2
+
+
+def test_add_documents_returns_false_on_error(service):
+    """Test that collection errors are reported as a failed insert."""
+    assert not service.add_documents("test_collection", ["first"], ids=["a", "b"])
+
+
+def test_count(service):
+    """Test counting documents in a collection."""
+    service.add_documents("test_collection", ["a", "b", "c"])
+
+    assert service.get_collection_count("test_collection") == 3
+
+
+@pytest.mark.parametrize(
+    "where, expected_ids",
+    [(None, ["doc1", "doc2"]), ({"topic": "ML"}, ["doc2"])],
+    ids=["query", "query_with_filter"],
+)
+def test_query(service, where, expected_ids):
+    """Test querying documents with and without a metadata filter."""
+    service.add_documents(
+        "test_collection",
+        ["about AI", "about ML", "about NLP"],
+        metadatas=[{"topic": "AI"}, {"topic": "ML"}, {"topic": "NLP"}],
+        ids=["doc1", "doc2", "doc3"],
+    )
+
+    results = service.query_documents(
+        "test_collection", query_texts="learning", n_results=2, where=where
+    )
+
+    assert results["ids"] == [expected_ids]
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [{}, {"query_texts": "x", "query_embeddings": [[0.0] * 8]}],
+    ids=["neither", "both"],
+)
+def test_query_requires_one_query_type(service, mock_client, kwargs):
+    """Test that exactly one of query_texts or query_embeddings is accepted."""
+    assert service.query_documents("test_no_query", **kwargs) is None
+    mock_client.create_collection.assert_not_called()
+
+
+def test_delete_collection(service, mock_client):
+    """Test that deleting a collection also drops it from the cache."""
+    service.get_or_create_collection("test_collection")
+
+    assert service.delete_collection("test_collection")
+    mock_client.delete_collection.assert_called_once_with(name="test_collection")
+    assert "test_collection" not in service._collections
+
+
+def test_add_documents_batches_inserts():
+    """Test that bulk inserts are coalesced into batched add() calls."""
+    service = ChromaDBService()
+    collection = MagicMock()
+    service._collections["bulk_collection"] = collection
+
+    documents = [f"doc {i}" for i in range(1000)]
+    metadatas = [{"index": i} for i in range(1000)]
+    ids = [f"id_{i}" for i in range(1000)]
+
+    success = service.add_documents(
+        collection_name="bulk_collection",
+        documents=documents,
+        metadatas=metadatas,
+        ids=ids,
+        batch_size=500,
+    )
+
+    assert success
+    assert collection.add.call_count == 2
+    first_batch = collection.add.call_args_list[0].kwargs
+    assert first_batch["ids"] == ids[:500]
+    assert first_batch["metadatas"] == metadatas[:500]
+    assert first_batch["embeddings"] is None
+
+
+def test_add_documents_removes_earlier_batches_on_failure():
+    """Test that a failed batch rolls back the batches already written."""
+    service = ChromaDBService()
+    collection = MagicMock()
+    collection.add.side_effect = [None, ValueError("bad batch")]
+    # id_0 was stored before this call and must survive the rollback
+    collection.get.side_effect = [{"ids": ["id_0"]}, {"ids": []}]
+    service._collections["bulk_collection"] = collection
+
+    ids = [f"id_{i}" for i in range(4)]
+
+    success = service.add_documents(
+        collection_name="bulk_collection",
+        documents=[f"doc {i}" for i in range(4)],
+        ids=ids,
+        batch_size=2,
+    )
 
-# Add the backend directory to the Python path
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))  # noqa: E402
-
-
-def test_chromadb_service():
-    """Test the ChromaDB service functionality."""
-    print("Testing ChromaDB Service...")
-
-    # Create a temporary directory for testing
-    temp_dir = tempfile.mkdtemp()
-    print(f"Using temporary directory: {temp_dir}")
-
-    try:
-        # Create a test Flask app
-        app = Flask(__name__)
-        app.config.from_object(config["testing"])
-        app.config["CHROMADB_PERSIST_PATH"] = os.path.join(temp_dir, "test_chroma")
-
-        with app.app_context():
-            # Initialize the service
-            service = ChromaDBService()
-
-            # Test 1: Create a collection
-            print("\nTest 1: Creating a collection...")
-            collection = service.get_or_create_collection("test_collection")
-            assert collection is not None
-            print("✓ Collection created successfully")
-
-            # Test 2: List collections
-            print("\nTest 2: Listing collections...")
-            collections = service.list_collections()
-            assert "test_collection" in collections
-            print(f"✓ Collections found: {collections}")
-
-            # Test 3: Add documents
-            print("\nTest 3: Adding documents...")
-            documents = [
-                "This is the first test document about artificial intelligence.",
-                "This is the second document discussing machine learning.",
-                "The third document covers natural language processing.",
-            ]
-            metadatas = [
-                {"topic": "AI", "source": "test"},
-                {"topic": "ML", "source": "test"},
-                {"topic": "NLP", "source": "test"},
-            ]
-
-            success = service.add_documents(
-                collection_name="test_collection",
-                documents=documents,
-                metadatas=metadatas,
-                ids=["doc1", "doc2", "doc3"],
-            )
-            assert success
-            print("✓ Documents added successfully")
-
-            # Test 4: Get collection count
-            print("\nTest 4: Getting collection count...")
-            count = service.get_collection_count("test_collection")
-            assert count == 3
-            print(f"✓ Collection count: {count}")
-
-            # Test 5: Query documents
-            print("\nTest 5: Querying documents...")
-            results = service.query_documents(
-                collection_name="test_collection",
-                query_texts="artificial intelligence",
-                n_results=2,
-            )
-            assert results is not None
-            assert len(results["ids"][0]) <= 2
-            print(f"✓ Query returned {len(results['ids'][0])} results")
-            print(f"  Top result: {results['documents'][0][0][:50]}...")
-
-            # Test 6: Query with metadata filter
-            print("\nTest 6: Querying with metadata filter...")
-            results = service.query_documents(
-                collection_name="test_collection",
-                query_texts="learning",
-                n_results=5,
-                where={"topic": "ML"},
-            )
-            assert results is not None
-            print(f"✓ Filtered query returned {len(results['ids'][0])} results")
-
-            # Test 7: Delete collection
-            print("\nTest 7: Deleting collection...")
-            success = service.delete_collection("test_collection")
-            assert success
-            collections = service.list_collections()
-            assert "test_collection" not in collections
-            print("✓ Collection deleted successfully")
-
-            print("\n🎉 All tests passed!")
-
-    except Exception as e:
-        print(f"❌ Test failed: {e}")
-        traceback.print_exc()
-        return False
-
-    finally:
-        # Clean up temporary directory
-        if os.path.exists(temp_dir):
-            shutil.rmtree(temp_dir)
-            print(f"Cleaned up temporary directory: {temp_dir}")
-
-    return True
-
-
-if __name__ == "__main__":
-    success = test_chromadb_service()
-    sys.exit(0 if success else 1)
+    assert not success
+    collection.delete.assert_called_once_with(ids=["id_1"])
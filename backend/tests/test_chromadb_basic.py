@@ -3,108 +3,52 @@ Simple test to verify ChromaDB service module syntax and basic structure.
 This test doesn't require ChromaDB to be installed.
 """
 
-import os
 import sys
-import traceback
 
-# Add the backend directory to the Python path
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import pytest
+
+from app.config.config import Config
+
+pytestmark = pytest.mark.fast
 
 
 def test_service_import():
     """Test that the ChromaDB service can be imported without errors."""
-    print("Testing ChromaDB service import...")
-
     try:
-        # Test imports
-        from flask import Flask
-
-        print(f"✓ Flask version {Flask.__version__} and config imports successful")
-
-        # Test that the service module can be imported
-        # (this will fail if ChromaDB is not installed, but we can handle that)
-        try:
-            from app.services.chromadb_service import ChromaDBService
-
-            print("✓ ChromaDBService import successful")
-
-            # Test basic initialization without creating a client
-            service = ChromaDBService()
-            print("✓ ChromaDBService instance created")
-
-            # Test that the service has the expected methods
-            expected_methods = [
-                "get_or_create_collection",
-                "list_collections",
-                "delete_collection",
-                "add_documents",
-                "query_documents",
-                "get_collection_count",
-                "reset_client",
-            ]
-
-            for method_name in expected_methods:
-                assert hasattr(service, method_name), f"Missing method: {method_name}"
-                print(f"✓ Method {method_name} exists")
-
-            print("\n🎉 Service structure test passed!")
-            return True
-
-        except ImportError as e:
-            if "chromadb" in str(e).lower():
-                print("⚠️  ChromaDB not installed - this is expected in CI environment")
-                print("   The service module structure appears correct")
-                return True
-            else:
-                raise
-
-    except Exception as e:
-        print(f"❌ Test failed: {e}")
-        traceback.print_exc()
-        return False
-
-
-def test_config_changes():
+        from app.services.chromadb_service import ChromaDBService
+    except ImportError as e:
+        if "chromadb" in str(e).lower():
+            pytest.skip("ChromaDB not installed")
+        raise
+
+    # Test basic initialization without creating a client
+    service = ChromaDBService()
+
+    # Test that the service has the expected methods
+    expected_methods = [
+        "get_or_create_collection",
+        "list_collections",
+        "delete_collection",
+        "add_documents",
+        "query_documents",
+        "get_collection_count",
+        "reset_client",
+    ]
+
+    missing = set(expected_methods) - {
+        name for name in dir(service) if callable(getattr(service, name, None))
+    }
+    assert not missing, f"Missing methods: {missing}"
+
+
+def test_config_changes(monkeypatch):
     """Test that the configuration changes are correct."""
-    print("\nTesting configuration changes...")
-
-    try:
-        from app.config.config import Config
-
-        # Test that CHROMADB_PERSIST_PATH is in the config
-        test_config = Config()
-
-        # Mock environment variable
-        os.environ["CHROMADB_PERSIST_PATH"] = "test/path"
+    monkeypatch.setenv("CHROMADB_PERSIST_PATH", "test/path")
+    assert Config().CHROMADB_PERSIST_PATH == "test/path"
 
-        # Create a new config instance to pick up the env var
-        test_config = Config()
-        assert hasattr(test_config, "CHROMADB_PERSIST_PATH")
-        print("✓ CHROMADB_PERSIST_PATH configuration exists")
-
-        # Test default value
-        if "CHROMADB_PERSIST_PATH" in os.environ:
-            del os.environ["CHROMADB_PERSIST_PATH"]
-
-        test_config = Config()
-        assert test_config.CHROMADB_PERSIST_PATH == "db/chroma"
-        print("✓ Default CHROMADB_PERSIST_PATH value is correct")
-
-        print("✓ Configuration test passed!")
-        return True
-
-    except Exception as e:
-        print(f"❌ Configuration test failed: {e}")
-        return False
+    monkeypatch.delenv("CHROMADB_PERSIST_PATH", raising=False)
+    assert Config().CHROMADB_PERSIST_PATH == "db/chroma"
 
 
 if __name__ == "__main__":
-    success1 = test_service_import()
-    success2 = test_config_changes()
-
-    if success1 and success2:
-        print("\n🎉 All basic tests passed!")
-        sys.exit(0)
-    else:
-        print("\n❌ Some tests failed!")
-        sys.exit(1)
+    sys.exit(pytest.main([__file__, "-s"]))
@@ -0,0 +1,70 @@
+"""
+Throughput benchmarks for ChromaDB ingestion and querying.
+
+Requires pytest-benchmark, which disables itself under pytest-xdist, so these
+tests carry the ``perf`` marker and are run in a separate serial step. Save a
+baseline and fail on regressions with::
+
+    pytest tests/test_chromadb_benchmark.py --benchmark-autosave
+    pytest tests/test_chromadb_benchmark.py --benchmark-compare \\
+        --benchmark-compare-fail=mean:20%
+"""
+
+import random
+import uuid
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+pytestmark = [pytest.mark.integration, pytest.mark.perf]
+
+DOCUMENT_COUNT = 1500
+EMBEDDING_DIM = 8
+
+
+def _random_embeddings(count):
+    """Build deterministic embeddings so the benchmark never runs a model."""
+    rng = random.Random(0)
+    return [[rng.random() for _ in range(EMBEDDING_DIM)] for _ in range(count)]
+
+
+@pytest.fixture(scope="module")
+def bulk_payload():
+    """Documents, metadata, IDs and embeddings for one bulk insert."""
+    return {
+        "documents": [f"d{i}" for i in range(DOCUMENT_COUNT)],
+        "metadatas": [{"index": i} for i in range(DOCUMENT_COUNT)],
+        "ids": [str(i) for i in range(DOCUMENT_COUNT)],
+        "embeddings": _random_embeddings(DOCUMENT_COUNT),
+    }
+
+
+def test_add_throughput(benchmark, chroma_service, bulk_payload):
+    """Benchmark a bulk insert into a fresh collection per round."""
+
+    def setup():
+        return (f"bench_add_{uuid.uuid4().hex}",), bulk_payload
+
+    result = benchmark.pedantic(
+        chroma_service.add_documents, setup=setup, rounds=3, iterations=1
+    )
+
+    assert result
+
+
+def test_query_throughput(benchmark, chroma_service, bulk_payload):
+    """Benchmark querying a populated collection with precomputed embeddings."""
+    collection_name = f"bench_query_{uuid.uuid4().hex}"
+    assert chroma_service.add_documents(collection_name, **bulk_payload)
+    query_embeddings = _random_embeddings(10)
+
+    results = benchmark(
+        chroma_service.query_documents,
+        collection_name,
+        n_results=10,
+        query_embeddings=query_embeddings,
+    )
+
+    assert results is not None
+    assert len(results["ids"]) == 10
@@ -0,0 +1,152 @@
+"""
+Integration tests for the ChromaDB service against a real persistent client.
+
+Run only these with ``pytest -m integration`` or skip them with
+``pytest -m "not integration"``.
+"""
+
+import hashlib
+import uuid
+
+import pytest
+from chromadb.api.types import EmbeddingFunction
+
+pytestmark = pytest.mark.integration
+
+DOCUMENTS = [
+    "This is the first test document about artificial intelligence.",
+    "This is the second document discussing machine learning.",
+    "The third document covers natural language processing.",
+]
+METADATAS = [
+    {"topic": "AI", "source": "test"},
+    {"topic": "ML", "source": "test"},
+    {"topic": "NLP", "source": "test"},
+]
+
+
+class _HashEmbeddingFunction(EmbeddingFunction):
+    """Deterministic offline embedding function for tests."""
+
+    def __init__(self):
+        pass
+
+    def __call__(self, input):
+        return [
+            [byte / 255 for byte in hashlib.sha256(text.encode()).digest()[:8]]
+            for text in input
+        ]
+
+
+@pytest.fixture(scope="session")
+def query_embeddings():
+    """Encode the fixed query strings once for the whole session."""
+    queries = ["artificial intelligence", "learning"]
+    return dict(zip(queries, _HashEmbeddingFunction()(queries)))
+
+
+@pytest.fixture
+def unique_collection_name(chroma_service):
+    """Provide a collection name unique to the test and drop it afterwards."""
+    name = f"test_{uuid.uuid4().hex}"
+    yield name
+    chroma_service.delete_collection(name)
+
+
+@pytest.fixture
+def populated_collection(chroma_service, unique_collection_name):
+    """Create a uniquely named collection holding the sample documents."""
+    chroma_service.get_or_create_collection(
+        unique_collection_name, embedding_function=_HashEmbeddingFunction()
+    )
+    assert chroma_service.add_documents(
+        collection_name=unique_collection_name,
+        documents=DOCUMENTS,
+        metadatas=METADATAS,
+        ids=["doc1", "doc2", "doc3"],
+    )
+    return unique_collection_name
+
+
+def test_collection_created(chroma_service, unique_collection_name):
+    """Test creating a collection."""
+    collection = chroma_service.get_or_create_collection(unique_collection_name)
+
+    assert collection is not None
+    assert collection.name == unique_collection_name
+
+
+def test_collection_listed(chroma_service, unique_collection_name):
+    """Test that a created collection appears in the collection list."""
+    chroma_service.get_or_create_collection(unique_collection_name)
+
+    assert unique_collection_name in chroma_service.list_collections()
+
+
+def test_add_documents(chroma_service, unique_collection_name):
+    """Test adding documents to a collection."""
+    chroma_service.get_or_create_collection(
+        unique_collection_name, embedding_function=_HashEmbeddingFunction()
+    )
+
+    assert chroma_service.add_documents(
+        collection_name=unique_collection_name,
+        documents=DOCUMENTS,
+        metadatas=METADATAS,
+    )
+
+
+def test_count(chroma_service, populated_collection):
+    """Test counting documents in a collection."""
+    assert chroma_service.get_collection_count(populated_collection) == 3
+
+
+@pytest.mark.parametrize(
+    "query, n_results, where, expected_ids",
+    [
+        ("artificial intelligence", 2, None, None),
+        ("learning", 5, {"topic": "ML"}, ["doc2"]),
+        ("learning", 5, {"topic": "missing"}, []),
+    ],
+    ids=["query", "query_with_filter", "query_with_unmatched_filter"],
+)
+def test_query(
+    chroma_service,
+    populated_collection,
+    query_embeddings,
+    query,
+    n_results,
+    where,
+    expected_ids,
+):
+    """Test querying documents with precomputed embeddings and filters."""
+    results = chroma_service.query_documents(
+        collection_name=populated_collection,
+        query_embeddings=[query_embeddings[query]],
+        n_results=n_results,
+        where=where,
+    )
+
+    assert results is not None
+    if expected_ids is None:
+        assert len(results["ids"][0]) == n_results
+    else:
+        assert results["ids"][0] == expected_ids
+
+
+def test_query_with_text(chroma_service, populated_collection):
+    """Test querying documents with text encoded by the collection."""
+    results = chroma_service.query_documents(
+        collection_name=populated_collection, query_texts="learning", n_results=1
+    )
+
+    assert results is not None
+    assert len(results["ids"][0]) == 1
+
+
+def test_delete_collection(chroma_service, unique_collection_name):
+    """Test deleting a collection."""
+    chroma_service.get_or_create_collection(unique_collection_name)
+
+    assert chroma_service.delete_collection(unique_collection_name)
+    assert unique_collection_name not in chroma_service.list_collections()
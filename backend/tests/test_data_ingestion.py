@@ -2,30 +2,6 @@
 Tests for the data ingestion service and API endpoint using pytest.
 """
 
-import json
-import tempfile
-import os
-from unittest.mock import MagicMock
-
-import pytest
-from app.main import create_app
-
-
-@pytest.fixture
-def client():
-    """Create a test client for the Flask application."""
-    app = create_app("testing")
-    with app.test_client() as client:
-        yield client
-
-
-@pytest.fixture
-def mock_data_ingestion_service(monkeypatch):
-    """Mock the DataIngestionService."""
-    mock_service = MagicMock()
-    monkeypatch.setattr("app.api.routes.data_ingestion_service", mock_service)
-    return mock_service
-
 
 def test_ingest_data_success(client, mock_data_ingestion_service):
     """Test successful data ingestion via the API."""
@@ -35,11 +11,7 @@ def test_ingest_data_success(client, mock_data_ingestion_service):
         "data": "This is a test document.",
         "metadata": {"source": "test"},
     }
-    response = client.post(
-        "/api/ingest",
-        data=json.dumps(payload),
-        content_type="application/json",
-    )
+    response = client.post("/api/ingest", json=payload)
     assert response.status_code == 200
     assert response.json["message"] == "Data ingested successfully"
     mock_data_ingestion_service.process_source.assert_called_once_with(
@@ -54,11 +26,7 @@ def test_ingest_data_failure(client, mock_data_ingestion_service):
         "source_type": "text",
         "data": "This is another test document.",
     }
-    response = client.post(
-        "/api/ingest",
-        data=json.dumps(payload),
-        content_type="application/json",
-    )
+    response = client.post("/api/ingest", json=payload)
     assert response.status_code == 500
     assert response.json["error"] == "Failed to ingest data"
 
@@ -72,11 +40,7 @@ def test_ingest_data_unsupported_type(client, mock_data_ingestion_service):
         "source_type": "invalid_type",
         "data": "This is a test document.",
     }
-    response = client.post(
-        "/api/ingest",
-        data=json.dumps(payload),
-        content_type="application/json",
-    )
+    response = client.post("/api/ingest", json=payload)
     assert response.status_code == 400
     assert response.json["error"] == ("Unsupported data source type: invalid_type")
 
@@ -84,116 +48,37 @@ def test_ingest_data_unsupported_type(client, mock_data_ingestion_service):
 def test_ingest_data_bad_request(client):
     """Test the /api/ingest endpoint with a bad request."""
     payload = {"data": "This is a test document."}  # Missing source_type
-    response = client.post(
-        "/api/ingest",
-        data=json.dumps(payload),
-        content_type="application/json",
-    )
+    response = client.post("/api/ingest", json=payload)
     assert response.status_code == 400
     assert response.json["error"] == "Missing source_type or data in request"
 
 
 def _create_test_markdown(
+    directory,
     content="# Test Markdown\n\nThis is test markdown content for ingestion testing.",
 ):
-    """Create a temporary Markdown file for testing."""
-    # Create temporary file
-    temp_file = tempfile.NamedTemporaryFile(suffix=".md", delete=False)
-    temp_file.write(content.encode())
-    temp_file.close()
-    return temp_file.name
-
-
-def _create_test_pdf(content="Test PDF content for ingestion testing."):
-    # Create a minimal valid PDF
-    pdf_content = f"""%PDF-1.4
-1 0 obj
-<<
-/Type /Catalog
-/Pages 2 0 R
->>
-endobj
-
-2 0 obj
-<<
-/Type /Pages
-/Kids [3 0 R]
-/Count 1
->>
-endobj
-
-3 0 obj
-<<
-/Type /Page
-/Parent 2 0 R
-/MediaBox [0 0 612 792]
-/Contents 4 0 R
->>
-endobj
-
-4 0 obj
-<<
-/Length {len(content) + 20}
->>
-stream
-BT
-/F1 12 Tf
-100 700 Td
-({content}) Tj
-ET
-endstream
-endobj
-
-xref
-0 5
-0000000000 65535 f
-0000000009 00000 n
-0000000058 00000 n
-0000000115 00000 n
-0000000206 00000 n
-trailer
-<<
-/Size 5
-/Root 1 0 R
->>
-startxref
-299
-%%EOF"""
-
-    # Create temporary file
-    temp_file = tempfile.NamedTemporaryFile(suffix=".pdf", delete=False)
-    temp_file.write(pdf_content.encode())
-    temp_file.close()
-    return temp_file.name
-
-
-def test_ingest_pdf_success(client, mock_data_ingestion_service):
+    """Create a Markdown file for testing in the given directory."""
+    markdown_path = directory / "test.md"
+    markdown_path.write_text(content)
+    return str(markdown_path)
+
+
+def test_ingest_pdf_success(client, mock_data_ingestion_service, sample_pdf_path):
     """Test successful PDF ingestion via the API."""
     mock_data_ingestion_service.process_source.return_value = True
+    pdf_path = sample_pdf_path
 
-    # Create a temporary test PDF
-    pdf_path = _create_test_pdf("Test PDF document for RAG chatbot processing.")
-
-    try:
-        payload = {
-            "source_type": "pdf",
-            "data": pdf_path,
-            "metadata": {"source": "test_pdf"},
-        }
-        response = client.post(
-            "/api/ingest",
-            data=json.dumps(payload),
-            content_type="application/json",
-        )
-        assert response.status_code == 200
-        assert response.json["message"] == "Data ingested successfully"
-        mock_data_ingestion_service.process_source.assert_called_once_with(
-            pdf_path, "pdf", {"source": "test_pdf"}
-        )
-    finally:
-        # Clean up temporary file
-        if os.path.exists(pdf_path):
-            os.unlink(pdf_path)
+    payload = {
+        "source_type": "pdf",
+        "data": pdf_path,
+        "metadata": {"source": "test_pdf"},
+    }
+    response = client.post("/api/ingest", json=payload)
+    assert response.status_code == 200
+    assert response.json["message"] == "Data ingested successfully"
+    mock_data_ingestion_service.process_source.assert_called_once_with(
+        pdf_path, "pdf", {"source": "test_pdf"}
+    )
 
 
 def test_ingest_pdf_failure(client, mock_data_ingestion_service):
@@ -207,44 +92,32 @@ def test_ingest_pdf_failure(client, mock_data_ingestion_service):
         "source_type": "pdf",
         "data": pdf_path,
     }
-    response = client.post(
-        "/api/ingest",
-        data=json.dumps(payload),
-        content_type="application/json",
-    )
+    response = client.post("/api/ingest", json=payload)
     assert response.status_code == 500
     assert response.json["error"] == "Failed to ingest data"
 
 
-def test_ingest_markdown_success(client, mock_data_ingestion_service):
+def test_ingest_markdown_success(client, mock_data_ingestion_service, tmp_path):
     """Test successful Markdown ingestion via the API."""
     mock_data_ingestion_service.process_source.return_value = True
 
-    # Create a temporary test Markdown file
+    # Create a test Markdown file in the per-test temporary directory
     markdown_path = _create_test_markdown(
-        "# Test Markdown\n\nThis is a test document for RAG chatbot processing."
+        tmp_path,
+        "# Test Markdown\n\nThis is a test document for RAG chatbot processing.",
     )
 
-    try:
-        payload = {
-            "source_type": "markdown",
-            "data": markdown_path,
-            "metadata": {"source": "test_markdown"},
-        }
-        response = client.post(
-            "/api/ingest",
-            data=json.dumps(payload),
-            content_type="application/json",
-        )
-        assert response.status_code == 200
-        assert response.json["message"] == "Data ingested successfully"
-        mock_data_ingestion_service.process_source.assert_called_once_with(
-            markdown_path, "markdown", {"source": "test_markdown"}
-        )
-    finally:
-        # Clean up temporary file
-        if os.path.exists(markdown_path):
-            os.unlink(markdown_path)
+    payload = {
+        "source_type": "markdown",
+        "data": markdown_path,
+        "metadata": {"source": "test_markdown"},
+    }
+    response = client.post("/api/ingest", json=payload)
+    assert response.status_code == 200
+    assert response.json["message"] == "Data ingested successfully"
+    mock_data_ingestion_service.process_source.assert_called_once_with(
+        markdown_path, "markdown", {"source": "test_markdown"}
+    )
 
 
 def test_ingest_markdown_failure(client, mock_data_ingestion_service):
@@ -258,11 +131,7 @@ def test_ingest_markdown_failure(client, mock_data_ingestion_service):
         "source_type": "markdown",
         "data": markdown_path,
     }
-    response = client.post(
-        "/api/ingest",
-        data=json.dumps(payload),
-        content_type="application/json",
-    )
+    response = client.post("/api/ingest", json=payload)
     assert response.status_code == 500
     assert response.json["error"] == "Failed to ingest data"
 
@@ -277,11 +146,7 @@ def test_ingest_url_success(client, mock_data_ingestion_service):
         "data": test_url,
         "metadata": {"source": "test_url"},
     }
-    response = client.post(
-        "/api/ingest",
-        data=json.dumps(payload),
-        content_type="application/json",
-    )
+    response = client.post("/api/ingest", json=payload)
     assert response.status_code == 200
     assert response.json["message"] == "Data ingested successfully"
     mock_data_ingestion_service.process_source.assert_called_once_with(
@@ -298,11 +163,7 @@ def test_ingest_url_failure(client, mock_data_ingestion_service):
         "source_type": "url",
         "data": test_url,
     }
-    response = client.post(
-        "/api/ingest",
-        data=json.dumps(payload),
-        content_type="application/json",
-    )
+    response = client.post("/api/ingest", json=payload)
     assert response.status_code == 500
     assert response.json["error"] == "Failed to ingest data"
 
@@ -317,11 +178,7 @@ def test_ingest_youtube_success(client, mock_data_ingestion_service):
         "data": test_youtube_url,
         "metadata": {"source": "test_youtube"},
     }
-    response = client.post(
-        "/api/ingest",
-        data=json.dumps(payload),
-        content_type="application/json",
-    )
+    response = client.post("/api/ingest", json=payload)
     assert response.status_code == 200
     assert response.json["message"] == "Data ingested successfully"
     mock_data_ingestion_service.process_source.assert_called_once_with(
@@ -338,10 +195,6 @@ def test_ingest_youtube_failure(client, mock_data_ingestion_service):
         "source_type": "youtube",
         "data": test_youtube_url,
     }
-    response = client.post(
-        "/api/ingest",
-        data=json.dumps(payload),
-        content_type="application/json",
-    )
+    response = client.post("/api/ingest", json=payload)
     assert response.status_code == 500
     assert response.json["error"] == "Failed to ingest data"
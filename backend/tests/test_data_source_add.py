@@ -2,137 +2,92 @@
 Tests for /api/data_source/add endpoint functionality.
 """
 
-import json
-import time
+import re
 from unittest.mock import patch
 
 import pytest
 
-from app.main import create_app
-
-
-@pytest.fixture
-def app():
-    """Create test Flask application."""
-    app = create_app("testing")
-    return app
-
-
-@pytest.fixture
-def client(app):
-    """Create test client."""
-    return app.test_client()
+from app.api.routes import _validate_data_source_payload
+
+
+@pytest.mark.parametrize(
+    "payload, expected_error",
+    [
+        ([], r"Missing 'type' or 'value' field"),
+        ({}, r"Missing 'type' or 'value' field"),
+        ({"type": "url"}, r"Missing 'type' or 'value' field"),
+        ({"value": "http://example.com"}, r"Missing 'type' or 'value' field"),
+        (
+            {"type": "invalid", "value": "some value"},
+            r"Invalid source type\. Allowed types: (url, markdown|markdown, url)",
+        ),
+        ({"type": "url", "value": ""}, r"Source value must be a non-empty string"),
+        ({"type": "url", "value": "   "}, r"Source value must be a non-empty string"),
+        ({"type": "url", "value": 123}, r"Source value must be a non-empty string"),
+        (
+            {"type": "url", "value": "not-a-valid-url"},
+            r"URL must start with http:// or https://",
+        ),
+    ],
+    ids=[
+        "not_an_object",
+        "missing_fields",
+        "missing_value",
+        "missing_type",
+        "invalid_type",
+        "empty_value",
+        "whitespace_value",
+        "non_string_value",
+        "invalid_url",
+    ],
+)
+def test_validate_data_source_payload_rejects(payload, expected_error):
+    """Test that invalid payloads produce a descriptive error."""
+    error = _validate_data_source_payload(payload)
+
+    assert error is not None
+    assert re.search(expected_error, error), error
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        {"type": "url", "value": "https://example.com"},
+        {"type": "url", "value": "http://example.com"},
+        {"type": "markdown", "value": "# Heading"},
+    ],
+    ids=["https_url", "http_url", "markdown"],
+)
+def test_validate_data_source_payload_accepts(payload):
+    """Test that valid payloads pass validation."""
+    assert _validate_data_source_payload(payload) is None
 
 
 class TestDataSourceAddEndpoint:
     """Test cases for the /api/data_source/add endpoint."""
 
-    def test_add_data_source_no_json(self, client):
-        """Test endpoint with no JSON data provided."""
-        response = client.post("/api/data_source/add")
-        assert response.status_code == 400
-        data = json.loads(response.data)
-        assert "error" in data
-        # Accept either error message depending on how Flask handles the request
-        assert (
-            "No JSON data provided" in data["error"]
-            or "Invalid JSON format" in data["error"]
-        )
-
-    def test_add_data_source_missing_fields(self, client):
-        """Test endpoint with missing required fields."""
-        # Missing both type and value
-        response = client.post(
-            "/api/data_source/add", data=json.dumps({}), content_type="application/json"
-        )
-        assert response.status_code == 400
-        data = json.loads(response.data)
-        assert "error" in data
-        assert "Missing 'type' or 'value' field" in data["error"]
-
-        # Missing value field
-        response = client.post(
-            "/api/data_source/add",
-            data=json.dumps({"type": "url"}),
-            content_type="application/json",
-        )
-        assert response.status_code == 400
-        data = json.loads(response.data)
-        assert "error" in data
-        assert "Missing 'type' or 'value' field" in data["error"]
-
-        # Missing type field
-        response = client.post(
-            "/api/data_source/add",
-            data=json.dumps({"value": "http://example.com"}),
-            content_type="application/json",
-        )
-        assert response.status_code == 400
-        data = json.loads(response.data)
-        assert "error" in data
-        assert "Missing 'type' or 'value' field" in data["error"]
-
-    def test_add_data_source_invalid_type(self, client):
-        """Test endpoint with invalid source type."""
-        response = client.post(
-            "/api/data_source/add",
-            data=json.dumps({"type": "invalid", "value": "some value"}),
-            content_type="application/json",
-        )
-        assert response.status_code == 400
-        data = json.loads(response.data)
-        assert "error" in data
-        assert "Invalid source type" in data["error"]
-        # Check that both allowed types are mentioned (order doesn't matter)
-        assert "url" in data["error"]
-        assert "markdown" in data["error"]
-
-    def test_add_data_source_empty_value(self, client):
-        """Test endpoint with empty or invalid values."""
-        # Empty string
-        response = client.post(
-            "/api/data_source/add",
-            data=json.dumps({"type": "url", "value": ""}),
-            content_type="application/json",
-        )
-        assert response.status_code == 400
-        data = json.loads(response.data)
-        assert "error" in data
-        assert "Source value must be a non-empty string" in data["error"]
-
-        # Whitespace only
-        response = client.post(
-            "/api/data_source/add",
-            data=json.dumps({"type": "url", "value": "   "}),
-            content_type="application/json",
-        )
-        assert response.status_code == 400
-        data = json.loads(response.data)
-        assert "error" in data
-        assert "Source value must be a non-empty string" in data["error"]
-
-        # Non-string value
-        response = client.post(
-            "/api/data_source/add",
-            data=json.dumps({"type": "url", "value": 123}),
-            content_type="application/json",
-        )
-        assert response.status_code == 400
-        data = json.loads(response.data)
-        assert "error" in data
-        assert "Source value must be a non-empty string" in data["error"]
+    @pytest.mark.parametrize(
+        "request_kwargs, expected_error",
+        [
+            ({}, r"No JSON data provided|Invalid JSON format"),
+            (
+                {"data": "malformed json", "content_type": "application/json"},
+                r"Invalid JSON format",
+            ),
+            (
+                {"json": {"type": "url", "value": "not-a-valid-url"}},
+                r"URL must start with http:// or https://",
+            ),
+        ],
+        ids=["no_json", "malformed_json", "invalid_payload"],
+    )
+    def test_add_data_source_bad_request(self, client, request_kwargs, expected_error):
+        """Test that unparseable or invalid requests are rejected with a 400."""
+        response = client.post("/api/data_source/add", **request_kwargs)
 
-    def test_add_data_source_invalid_url(self, client):
-        """Test endpoint with invalid URL format."""
-        response = client.post(
-            "/api/data_source/add",
-            data=json.dumps({"type": "url", "value": "not-a-valid-url"}),
-            content_type="application/json",
-        )
         assert response.status_code == 400
-        data = json.loads(response.data)
-        assert "error" in data
-        assert "URL must start with http:// or https://" in data["error"]
+        data = response.get_json()
+        assert re.search(expected_error, data["error"]), data["error"]
 
     @patch("app.api.routes.data_ingestion_service.process_source")
     def test_add_data_source_valid_url(self, mock_process_source, client):
@@ -140,12 +95,10 @@ class TestDataSourceAddEndpoint:
         mock_process_source.return_value = True
 
         response = client.post(
-            "/api/data_source/add",
-            data=json.dumps({"type": "url", "value": "https://example.com"}),
-            content_type="application/json",
+            "/api/data_source/add", json={"type": "url", "value": "https://example.com"}
         )
         assert response.status_code == 202
-        data = json.loads(response.data)
+        data = response.get_json()
 
         # Check response structure
         assert "task_id" in data
@@ -165,12 +118,10 @@ class TestDataSourceAddEndpoint:
 
         markdown_content = "# Test Markdown\n\nThis is a test."
         response = client.post(
-            "/api/data_source/add",
-            data=json.dumps({"type": "markdown", "value": markdown_content}),
-            content_type="application/json",
+            "/api/data_source/add", json={"type": "markdown", "value": markdown_content}
         )
         assert response.status_code == 202
-        data = json.loads(response.data)
+        data = response.get_json()
 
         # Check response structure
         assert "task_id" in data
@@ -190,40 +141,23 @@ class TestDataSourceAddEndpoint:
 
         youtube_url = "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
         response = client.post(
-            "/api/data_source/add",
-            data=json.dumps({"type": "url", "value": youtube_url}),
-            content_type="application/json",
+            "/api/data_source/add", json={"type": "url", "value": youtube_url}
         )
         assert response.status_code == 202
 
-        # Give a moment for the async processing to start
-        time.sleep(0.1)
-
-        # Verify that process_source was called with 'youtube' type
+        # Ingestion runs inline under the testing config, so verify process_source
+        # was called with 'youtube' type
         mock_process_source.assert_called_once()
         args, kwargs = mock_process_source.call_args
         assert args[0] == youtube_url  # source_value
         assert args[1] == "youtube"  # processing_type (should be detected as youtube)
 
-    def test_add_data_source_error_handling(self, client):
-        """Test error handling in the endpoint."""
-        # Test with malformed JSON
-        response = client.post(
-            "/api/data_source/add",
-            data="malformed json",
-            content_type="application/json",
-        )
-        assert response.status_code == 400
-        data = json.loads(response.data)
-        assert "error" in data
-        assert "Invalid JSON format" in data["error"]
-
     def test_get_data_source_status_endpoint(self, client):
         """Test the status endpoint for data source tasks."""
         # Test with non-existent task ID
         response = client.get("/api/data_source/status/non-existent-task")
         assert response.status_code == 404
-        data = json.loads(response.data)
+        data = response.get_json()
         assert "error" in data
         assert "Task not found" in data["error"]
 
@@ -236,21 +170,17 @@ class TestDataSourceAddEndpoint:
 
         # First, create a data source addition task
         response = client.post(
-            "/api/data_source/add",
-            data=json.dumps({"type": "url", "value": "https://example.com"}),
-            content_type="application/json",
+            "/api/data_source/add", json={"type": "url", "value": "https://example.com"}
         )
         assert response.status_code == 202
-        data = json.loads(response.data)
+        data = response.get_json()
         task_id = data["task_id"]
 
-        # Give a brief moment for the task to be registered
-        time.sleep(0.1)
-
+        # Testing config runs ingestion inline, so the status is already final
         # Now test the status endpoint with the valid task ID
         status_response = client.get(f"/api/data_source/status/{task_id}")
         assert status_response.status_code == 200
-        status_data = json.loads(status_response.data)
+        status_data = status_response.get_json()
 
         # Check response structure
         assert "task_id" in status_data
@@ -259,5 +189,5 @@ class TestDataSourceAddEndpoint:
 
         # Check response values
         assert status_data["task_id"] == task_id
-        assert status_data["status"] in ["processing", "completed", "failed"]
+        assert status_data["status"] == "completed"
         assert status_data["source_type"] == "url"
@@ -3,24 +3,10 @@ Test for the backend directory structure organization.
 Validates that the new app/api/ structure works correctly.
 """
 
-import pytest
-from app.main import create_app
-
 
 class TestBackendStructure:
     """Test the backend directory structure."""
 
-    @pytest.fixture
-    def app(self):
-        """Create and configure a test application."""
-        app = create_app("testing")
-        return app
-
-    @pytest.fixture
-    def client(self, app):
-        """Create a test client for the Flask application."""
-        return app.test_client()
-
     def test_api_blueprint_registration(self, app):
         """Test that the API blueprint is properly registered."""
         # Check that the app has the expected blueprints
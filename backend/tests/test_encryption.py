@@ -2,6 +2,9 @@
 Test file for encryption/decryption functionality.
 """
 
+import sys
+from types import MappingProxyType
+
 import pytest
 from cryptography.fernet import Fernet
 from flask import Flask
@@ -9,6 +12,26 @@ from flask import Flask
 from app.models.models import init_db
 from app.services.persistence_service import PersistenceManager
 
+# Generated once so every app built from TestConfig shares the same key
+ENCRYPTION_KEY = Fernet.generate_key()
+
+# Read-only so no test can leak changes into another through shared payloads
+_SAMPLE_KEYS = MappingProxyType(
+    {
+        "openai": "sk-test-openai-key-123",
+        "anthropic": "sk-ant-test-key-456",
+        "google": "test-google-key-789",
+    }
+)
+_USER_KEYS = MappingProxyType(
+    {"openai": "sk-test-key-123", "anthropic": "sk-ant-key-456"}
+)
+_SET_KEYS = MappingProxyType({"openai": "sk-test-key-999", "cohere": "test-cohere-key"})
+_INITIAL_KEYS = MappingProxyType({"openai": "initial-key"})
+_UPDATED_KEYS = MappingProxyType(
+    {"openai": "updated-key", "anthropic": "new-anthropic-key"}
+)
+
 
 class TestConfig:
     """Test configuration."""
@@ -16,38 +39,34 @@ class TestConfig:
     TESTING = True
     SQLALCHEMY_DATABASE_URI = "sqlite:///:memory:"
     SQLALCHEMY_TRACK_MODIFICATIONS = False
-    ENCRYPTION_KEY = Fernet.generate_key()
+    ENCRYPTION_KEY = ENCRYPTION_KEY
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def app():
-    """Create test Flask application."""
+    """Create the test Flask application and schema once."""
     app = Flask(__name__)
     app.config.from_object(TestConfig)
+    init_db(app)
+    return app
 
-    with app.app_context():
-        init_db(app)
-        yield app
+
+@pytest.fixture(scope="session")
+def _persistence_manager(app):
+    """Create one PersistenceManager so its cipher is built only once."""
+    return PersistenceManager()
 
 
 @pytest.fixture
-def persistence_manager(app):
-    """Create PersistenceManager instance for testing."""
-    with app.app_context():
-        return PersistenceManager()
+def persistence_manager(_persistence_manager, db_session):
+    """Provide the shared PersistenceManager inside a rolled-back transaction."""
+    return _persistence_manager
 
 
 def test_encrypt_decrypt_key(persistence_manager):
     """Test encryption and decryption of API keys."""
-    # Test data
-    api_keys = {
-        "openai": "sk-test-openai-key-123",
-        "anthropic": "sk-ant-test-key-456",
-        "google": "test-google-key-789",
-    }
-
     # Test encryption
-    encrypted_data = persistence_manager.encrypt_key(api_keys)
+    encrypted_data = persistence_manager.encrypt_key(dict(_SAMPLE_KEYS))
     assert encrypted_data is not None
     assert isinstance(encrypted_data, bytes)
     assert len(encrypted_data) > 0
@@ -56,42 +75,29 @@ def test_encrypt_decrypt_key(persistence_manager):
     decrypted_data = persistence_manager.decrypt_key(encrypted_data)
     assert decrypted_data is not None
     assert isinstance(decrypted_data, dict)
-    assert decrypted_data == api_keys
+    assert decrypted_data == _SAMPLE_KEYS
 
 
-def test_encrypt_empty_data(persistence_manager):
-    """Test encryption with empty data."""
-    # Test with None
-    encrypted_data = persistence_manager.encrypt_key(None)
-    assert encrypted_data is None
+@pytest.mark.parametrize("payload", [None, {}], ids=["none", "empty_dict"])
+def test_encrypt_empty_data(persistence_manager, payload):
+    """Test that empty data is not encrypted."""
+    assert persistence_manager.encrypt_key(payload) is None
 
-    # Test with empty dict
-    encrypted_data = persistence_manager.encrypt_key({})
-    assert encrypted_data is None
 
-
-def test_decrypt_empty_data(persistence_manager):
-    """Test decryption with empty data."""
-    # Test with None
-    decrypted_data = persistence_manager.decrypt_key(None)
-    assert decrypted_data is None
-
-
-def test_decrypt_invalid_data(persistence_manager):
-    """Test decryption with invalid data."""
-    # Test with invalid encrypted data
-    decrypted_data = persistence_manager.decrypt_key(b"invalid_data")
-    assert decrypted_data is None
+@pytest.mark.parametrize(
+    "encrypted_data", [None, b"invalid_data"], ids=["none", "invalid_data"]
+)
+def test_decrypt_unusable_data(persistence_manager, encrypted_data):
+    """Test that empty or invalid encrypted data decrypts to None."""
+    assert persistence_manager.decrypt_key(encrypted_data) is None
 
 
 def test_create_user_settings_with_api_keys(persistence_manager):
     """Test creating user settings with encrypted API keys."""
-    api_keys = {"openai": "sk-test-key-123", "anthropic": "sk-ant-key-456"}
-
     # Create user settings
     user_settings = persistence_manager.create_user_settings(
         user_id="test_user",
-        api_keys=api_keys,
+        api_keys=dict(_USER_KEYS),
         custom_prompts='{"system": "You are a helpful assistant"}',
     )
 
@@ -104,31 +110,27 @@ def test_create_user_settings_with_api_keys(persistence_manager):
 def test_get_set_api_keys(persistence_manager):
     """Test getting and setting API keys for a user."""
     user_id = "test_user_2"
-    api_keys = {"openai": "sk-test-key-999", "cohere": "test-cohere-key"}
-
     # Set API keys
-    success = persistence_manager.set_api_keys(user_id, api_keys)
+    success = persistence_manager.set_api_keys(user_id, dict(_SET_KEYS))
     assert success is True
 
     # Get API keys
     retrieved_keys = persistence_manager.get_api_keys(user_id)
     assert retrieved_keys is not None
-    assert retrieved_keys == api_keys
+    assert retrieved_keys == _SET_KEYS
 
 
 def test_update_user_settings_with_api_keys(persistence_manager):
     """Test updating user settings with new encrypted API keys."""
     # Create initial user settings
-    initial_keys = {"openai": "initial-key"}
     user_settings = persistence_manager.create_user_settings(
-        user_id="test_update_user", api_keys=initial_keys
+        user_id="test_update_user", api_keys=dict(_INITIAL_KEYS)
     )
     assert user_settings is not None
 
     # Update with new API keys
-    new_keys = {"openai": "updated-key", "anthropic": "new-anthropic-key"}
     updated_settings = persistence_manager.update_user_settings(
-        user_settings.id, api_keys=new_keys
+        user_settings.id, api_keys=dict(_UPDATED_KEYS)
     )
 
     assert updated_settings is not None
@@ -136,7 +138,7 @@ def test_update_user_settings_with_api_keys(persistence_manager):
 
     # Verify the keys were updated
     retrieved_keys = persistence_manager.get_api_keys("test_update_user")
-    assert retrieved_keys == new_keys
+    assert retrieved_keys == _UPDATED_KEYS
 
 
 def test_no_encryption_key_app():
@@ -165,4 +167,4 @@ def test_no_encryption_key_app():
 
 
 if __name__ == "__main__":
-    pytest.main([__file__, "-v"])
+    sys.exit(pytest.main([__file__, "-v"]))
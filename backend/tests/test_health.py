@@ -2,53 +2,32 @@
 Test module for health check endpoints.
 """
 
-import json
 import logging
-import os
 import sys
 
-# Add the parent directory to the path to import the app
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+import pytest
 
 # Configure logger
 logger = logging.getLogger(__name__)
 
 
-def test_health_endpoint():
+def test_health_endpoint(client):
     """Test the /api/health endpoint returns correct response."""
-    try:
-        from app.main import create_app
+    # Test GET request to /api/health
+    response = client.get("/api/health")
 
-        # Create test app
-        app = create_app("testing")
+    # Check status code is 200 OK
+    assert response.status_code == 200, f"Expected 200, got {response.status_code}"
 
-        with app.test_client() as client:
-            # Test GET request to /api/health
-            response = client.get("/api/health")
+    # Check response is JSON
+    assert response.is_json, f"Expected JSON, got {response.content_type}"
 
-            # Check status code is 200 OK
-            assert (
-                response.status_code == 200
-            ), f"Expected 200, got {response.status_code}"
+    # Check response body
+    data = response.get_json()
+    assert data == {"status": "ok"}, f"Expected {{'status': 'ok'}}, got {data}"
 
-            # Check response is JSON
-            assert (
-                response.content_type == "application/json"
-            ), f"Expected JSON, got {response.content_type}"
-
-            # Check response body
-            data = json.loads(response.data)
-            assert data == {"status": "ok"}, f"Expected {{'status': 'ok'}}, got {data}"
-
-            logger.info("Health endpoint test passed!")
-
-    except ImportError as e:
-        logger.error(f"Flask not available for testing: {e}")
-        # Basic validation of expected response format
-        expected_response = {"status": "ok"}
-        assert expected_response["status"] == "ok"
-        logger.info("Health endpoint format validation passed")
+    logger.info("Health endpoint test passed!")
 
 
 if __name__ == "__main__":
-    test_health_endpoint()
+    sys.exit(pytest.main([__file__, "-v"]))
@@ -2,127 +2,141 @@
 Test module for history endpoint.
 """
 
-import json
 import logging
-import os
 import sys
 
-# Add the parent directory to the path to import the app
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+import pytest
+
+from app.models.models import db
+from app.services.persistence_service import PersistenceManager
 
 # Configure logger
 logger = logging.getLogger(__name__)
 
+_EXPECTED_HISTORY_FIELDS = frozenset(
+    {
+        "id",
+        "session_id",
+        "user_message",
+        "bot_response",
+        "timestamp",
+        "context_sources",
+    }
+)
 
-def test_history_endpoint_empty():
-    """Test the /api/history endpoint returns empty array when no data."""
-    try:
-        from app.main import create_app
-
-        # Create test app
-        app = create_app("testing")
-
-        with app.test_client() as client:
-            # Test GET request to /api/history
-            response = client.get("/api/history")
-
-            # Check status code is 200 OK
-            assert (
-                response.status_code == 200
-            ), f"Expected 200, got {response.status_code}"
 
-            # Check response is JSON
-            assert (
-                response.content_type == "application/json"
-            ), f"Expected JSON, got {response.content_type}"
+@pytest.fixture
+def persistence_manager(app, client):
+    """Create a PersistenceManager bound to the shared app's database."""
+    with app.app_context():
+        yield PersistenceManager()
 
-            # Check response body is an array
-            data = json.loads(response.data)
-            assert isinstance(data, list), f"Expected array, got {type(data)}"
 
-            logger.info("History endpoint empty test passed!")
-
-    except ImportError as e:
-        logger.error(f"Flask not available for testing: {e}")
-        logger.info("History endpoint empty validation skipped")
-
-
-def test_history_endpoint_with_data():
+def test_history_endpoint_empty(client):
+    """Test the /api/history endpoint returns empty array when no data."""
+    # Test GET request to /api/history
+    response = client.get("/api/history")
+
+    # Check status code is 200 OK
+    assert response.status_code == 200, f"Expected 200, got {response.status_code}"
+
+    # Check response is JSON
+    assert response.is_json, f"Expected JSON, got {response.content_type}"
+
+    # Check response body is an array
+    data = response.get_json()
+    assert isinstance(data, list), f"Expected array, got {type(data)}"
+    assert data == [], f"Expected no items, got {data}"
+
+    logger.info("History endpoint empty test passed!")
+
+
+@pytest.fixture
+def seeded_history(persistence_manager):
+    """Seed two chat messages in one session and return the session ID."""
+    session_id = "test_session_1"
+    persistence_manager.bulk_create_chat_history(
+        [
+            {
+                "session_id": session_id,
+                "user_message": "Hello",
+                "bot_response": "Hi there!",
+            },
+            {
+                "session_id": session_id,
+                "user_message": "How are you?",
+                "bot_response": "I'm doing well, thank you!",
+            },
+        ]
+    )
+    return session_id
+
+
+@pytest.fixture
+def history_response(client, seeded_history):
+    """Fetch the seeded history through the /api/history endpoint."""
+    return client.get("/api/history")
+
+
+def test_history_endpoint_with_data(history_response):
     """Test the /api/history endpoint returns data when chat history exists."""
-    try:
-        from app.main import create_app
-        from app.models.models import db
-        from app.services.persistence_service import PersistenceManager
-
-        # Create test app
-        app = create_app("testing")
-
-        with app.app_context():
-            # Initialize database and create test data
-            db.create_all()
-
-            persistence_manager = PersistenceManager()
-
-            # Create test chat history
-            persistence_manager.create_chat_history(
-                session_id="test_session_1",
-                user_message="Hello",
-                bot_response="Hi there!",
-            )
-
-            persistence_manager.create_chat_history(
-                session_id="test_session_1",
-                user_message="How are you?",
-                bot_response="I'm doing well, thank you!",
-            )
-
-            with app.test_client() as client:
-                # Test GET request to /api/history
-                response = client.get("/api/history")
-
-                # Check status code is 200 OK
-                assert (
-                    response.status_code == 200
-                ), f"Expected 200, got {response.status_code}"
-
-                # Check response is JSON
-                assert (
-                    response.content_type == "application/json"
-                ), f"Expected JSON, got {response.content_type}"
-
-                # Check response body
-                data = json.loads(response.data)
-                assert isinstance(data, list), f"Expected array, got {type(data)}"
-                assert len(data) == 2, f"Expected 2 items, got {len(data)}"
-
-                # Check first item structure
-                first_item = data[0]
-                expected_fields = {
-                    "id",
-                    "session_id",
-                    "user_message",
-                    "bot_response",
-                    "timestamp",
-                    "context_sources",
-                }
-                assert set(first_item.keys()) == expected_fields, (
-                    f"Expected fields {expected_fields}, "
-                    f"got {set(first_item.keys())}"
-                )
-
-                # Check data content
-                assert first_item["session_id"] == "test_session_1"
-                assert first_item["user_message"] == "Hello"
-                assert first_item["bot_response"] == "Hi there!"
-                assert first_item["timestamp"] is not None
-
-                logger.info("History endpoint with data test passed!")
-
-    except ImportError as e:
-        logger.error(f"Flask not available for testing: {e}")
-        logger.info("History endpoint with data validation skipped")
+    # Check status code is 200 OK
+    assert (
+        history_response.status_code == 200
+    ), f"Expected 200, got {history_response.status_code}"
+
+    # Check response is JSON
+    assert (
+        history_response.is_json
+    ), f"Expected JSON, got {history_response.content_type}"
+
+    history_items = history_response.get_json()
+    assert isinstance(history_items, list), f"Expected array, got {type(history_items)}"
+    assert len(history_items) == 2, f"Expected 2 items, got {len(history_items)}"
+
+    logger.info("History endpoint with data test passed!")
+
+
+def test_history_item_fields(history_response):
+    """Test that history items expose exactly the serialized fields."""
+    first_item = history_response.get_json()[0]
+    assert set(first_item.keys()) == _EXPECTED_HISTORY_FIELDS, (
+        f"Expected fields {set(_EXPECTED_HISTORY_FIELDS)}, "
+        f"got {set(first_item.keys())}"
+    )
+
+
+def test_history_item_content(history_response, seeded_history):
+    """Test that history items carry the stored message content."""
+    # Select by message rather than position so the endpoint's order is free
+    by_message = {item["user_message"]: item for item in history_response.get_json()}
+    first_item = by_message["Hello"]
+    assert first_item["session_id"] == seeded_history
+    assert first_item["user_message"] == "Hello"
+    assert first_item["bot_response"] == "Hi there!"
+    assert first_item["timestamp"] is not None
+
+
+def test_history_endpoint_query_count(client, persistence_manager, count_queries):
+    """Test that /api/history loads all rows with a single query."""
+    persistence_manager.bulk_create_chat_history(
+        [
+            {
+                "session_id": f"session_{i}",
+                "user_message": "Hello",
+                "bot_response": "Hi!",
+            }
+            for i in range(5)
+        ]
+    )
+
+    with count_queries(db.engine) as queries:
+        response = client.get("/api/history")
+
+    assert response.status_code == 200
+    assert len(response.get_json()) == 5
+    assert len(queries) <= 1, f"Expected at most 1 query, got {queries}"
 
 
 if __name__ == "__main__":
-    test_history_endpoint_empty()
-    test_history_endpoint_with_data()
+    sys.exit(pytest.main([__file__, "-v"]))
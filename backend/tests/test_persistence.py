@@ -0,0 +1,193 @@
+"""
+Tests for PersistenceManager query helpers.
+"""
+
+import pytest
+from flask import Flask
+from sqlalchemy import inspect, text
+
+from app.config.config import config
+from app.models.models import DataSource, Transcription, db, init_db
+from app.services.persistence_service import PersistenceManager
+
+
+@pytest.fixture
+def persistence_manager(db_session):
+    """Create a PersistenceManager whose writes are rolled back afterwards."""
+    return PersistenceManager()
+
+
+@pytest.fixture
+def data_sources(persistence_manager):
+    """Create data sources with mixed types and statuses."""
+    sources = [
+        persistence_manager.create_data_source("pdf", "/tmp/a.pdf", "A"),
+        persistence_manager.create_data_source("url", "https://example.com", "B"),
+        persistence_manager.create_data_source("pdf", "/tmp/c.pdf", "C"),
+    ]
+    persistence_manager.update_data_source(sources[0].id, status="processed")
+    return sources
+
+
+def test_status_indexes_exist(app):
+    """Test that the filter columns are backed by indexes."""
+    with app.app_context():
+        inspector = inspect(db.engine)
+        data_source_indexes = {
+            index["name"] for index in inspector.get_indexes(DataSource.__tablename__)
+        }
+        transcription_indexes = {
+            index["name"]
+            for index in inspector.get_indexes(Transcription.__tablename__)
+        }
+
+    assert "ix_data_source_status_type" in data_source_indexes
+    assert "ix_data_source_source_type" in data_source_indexes
+    assert "ix_transcription_status" in transcription_indexes
+
+
+def test_get_data_sources_by_status(persistence_manager, data_sources):
+    """Test filtering data sources by status."""
+    pending = persistence_manager.get_data_sources_by_status("pending")
+
+    assert {source.display_name for source in pending} == {"B", "C"}
+
+
+def test_get_data_sources_by_type_with_columns(persistence_manager, data_sources):
+    """Test that requested columns are loaded and the rest are deferred."""
+    db.session.expunge_all()
+
+    pdfs = persistence_manager.get_data_sources_by_type(
+        "pdf", columns=["id", "display_name"]
+    )
+
+    assert {source.display_name for source in pdfs} == {"A", "C"}
+    assert "source_path" in inspect(pdfs[0]).unloaded
+
+
+def test_iter_data_sources_by_status(persistence_manager, data_sources):
+    """Test streaming data sources by status."""
+    pending = persistence_manager.iter_data_sources_by_status(
+        "pending", columns=["id", "display_name"], batch_size=1
+    )
+
+    assert sorted(source.display_name for source in pending) == ["B", "C"]
+
+
+def test_get_transcriptions_by_status(persistence_manager):
+    """Test filtering transcriptions by status."""
+    persistence_manager.create_transcription("https://youtu.be/dQw4w9WgXcQ")
+
+    pending = persistence_manager.get_transcriptions_by_status(
+        "pending", columns=["id", "youtube_url"]
+    )
+
+    assert len(pending) == 1
+    assert pending[0].youtube_url == "https://youtu.be/dQw4w9WgXcQ"
+
+
+def test_delete_chat_sessions(persistence_manager):
+    """Test deleting several sessions in chunked bulk statements."""
+    for session_id in ("s1", "s1", "s2", "s3"):
+        persistence_manager.create_chat_history(session_id, "Hello")
+
+    deleted = persistence_manager.delete_chat_sessions(["s1", "s2"], chunk_size=1)
+
+    assert deleted == 3
+    assert persistence_manager.get_chat_history_by_session("s1") == []
+    assert len(persistence_manager.get_chat_history_by_session("s3")) == 1
+
+
+def test_delete_chat_sessions_commit_per_chunk(persistence_manager):
+    """Test chunked deletion with a commit after every chunk."""
+    for session_id in ("s1", "s2"):
+        persistence_manager.create_chat_history(session_id, "Hello")
+
+    deleted = persistence_manager.delete_chat_sessions(
+        iter(["s1", "s2", "missing"]), chunk_size=2, commit_per_chunk=True
+    )
+
+    assert deleted == 2
+    assert persistence_manager.get_recent_chat_history() == []
+
+
+def test_bulk_create_chat_history(persistence_manager):
+    """Test creating several chat history records in one commit."""
+    created = persistence_manager.bulk_create_chat_history(
+        [
+            {"session_id": "s1", "user_message": "Hello"},
+            {"session_id": "s1", "user_message": "Again", "bot_response": "Hi!"},
+        ]
+    )
+
+    assert [chat.user_message for chat in created] == ["Hello", "Again"]
+    assert all(chat.id is not None for chat in created)
+    assert len(persistence_manager.get_chat_history_by_session("s1")) == 2
+
+
+def test_list_recent_chat_history_rows(persistence_manager):
+    """Test that recent chat history is returned as plain dictionaries."""
+    persistence_manager.create_chat_history("s1", "Hello", bot_response="Hi!")
+
+    rows = persistence_manager.list_recent_chat_history_rows(limit=10)
+
+    assert len(rows) == 1
+    assert isinstance(rows[0], dict)
+    assert rows[0]["session_id"] == "s1"
+    assert rows[0]["bot_response"] == "Hi!"
+    assert set(rows[0]) == {
+        "id",
+        "session_id",
+        "user_message",
+        "bot_response",
+        "timestamp",
+        "context_sources",
+    }
+
+
+def test_sqlite_file_database_uses_wal(tmp_path):
+    """Test that file-backed SQLite databases are switched to WAL mode."""
+    app = Flask(__name__)
+    app.config.from_object(config["testing"])
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{tmp_path / 'test.db'}"
+
+    with app.app_context():
+        init_db(app)
+        journal_mode = db.session.execute(text("PRAGMA journal_mode")).scalar()
+        synchronous = db.session.execute(text("PRAGMA synchronous")).scalar()
+        db.session.remove()
+        db.engine.dispose()
+
+    assert journal_mode == "wal"
+    assert synchronous == 1  # NORMAL
+
+
+def test_init_db_adds_indexes_to_existing_tables(tmp_path):
+    """Test that init_db creates indexes missing from an older database."""
+    database_uri = f"sqlite:///{tmp_path / 'test.db'}"
+
+    def _init_app():
+        app = Flask(__name__)
+        app.config.from_object(config["testing"])
+        app.config["SQLALCHEMY_DATABASE_URI"] = database_uri
+        init_db(app)
+        return app
+
+    app = _init_app()
+    with app.app_context():
+        # Simulate a database created before the status indexes existed
+        db.session.execute(text("DROP INDEX ix_transcription_status"))
+        db.session.commit()
+        db.session.remove()
+        db.engine.dispose()
+
+    app = _init_app()
+    with app.app_context():
+        indexes = {
+            index["name"]
+            for index in inspect(db.engine).get_indexes(Transcription.__tablename__)
+        }
+        db.session.remove()
+        db.engine.dispose()
+
+    assert "ix_transcription_status" in indexes
@@ -2,170 +2,107 @@
 Test module for /api/settings endpoints.
 """
 
-import json
 import logging
-import os
 import sys
 
 import pytest
-from cryptography.fernet import Fernet
 
-# Add the parent directory to the path to import the app
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from app.models.models import db
 
 # Configure logger
 logger = logging.getLogger(__name__)
 
+# Request payloads and response shape shared by the tests below
+_POST_SETTINGS = {
+    "api_keys": {
+        "openai_api_key": "test-key-123",
+        "huggingface_token": "test-token-456",
+    },
+    "custom_prompts": '{"system": "You are a helpful assistant."}',
+}
+_INITIAL_SETTINGS = {
+    "api_keys": {
+        "openai_api_key": "initial-openai-key",
+        "huggingface_token": "initial-hf-token",
+    },
+    "custom_prompts": '{"system": "Initial prompt"}',
+}
+_UPDATE_SETTINGS = {"api_keys": {"openai_api_key": "updated-openai-key"}}
+_INVALID_PROMPTS_SETTINGS = {
+    "api_keys": {"openai_api_key": "test-key-123"},
+    "custom_prompts": '{"system": "Invalid JSON"',  # Missing closing brace
+}
+# Sanitized api_keys for the two keys above; values are never echoed back
+_CONFIGURED_API_KEYS = {
+    "openai_api_key": "configured",
+    "huggingface_token": "configured",
+}
+_EXPECTED_SETTINGS_KEYS = frozenset(
+    {"user_id", "api_keys", "custom_prompts", "created_at", "updated_at"}
+)
+
 
-def test_get_settings_endpoint():
+def test_get_settings_endpoint(client):
     """Test the GET /api/settings endpoint returns correct response."""
-    try:
-        from app.main import create_app
-
-        # Create test app
-        app = create_app("testing")
-
-        with app.test_client() as client:
-            # Test GET request to /api/settings
-            response = client.get("/api/settings")
-
-            # Check status code is 200 OK
-            assert (
-                response.status_code == 200
-            ), f"Expected 200, got {response.status_code}"
-
-            # Check response is JSON
-            assert (
-                response.content_type == "application/json"
-            ), f"Expected JSON, got {response.content_type}"
-
-            # Check response body structure
-            data = json.loads(response.data)
-            expected_keys = {
-                "user_id",
-                "api_keys",
-                "custom_prompts",
-                "created_at",
-                "updated_at",
-            }
-            assert (
-                set(data.keys()) == expected_keys
-            ), f"Expected keys {expected_keys}, got {set(data.keys())}"
-
-            # Check that API keys object exists (should be empty for new user)
-            assert isinstance(data["api_keys"], dict), "API keys should be a dictionary"
-
-            # Check user_id is default_user
-            assert (
-                data["user_id"] == "default_user"
-            ), f"Expected default_user, got {data['user_id']}"
-
-            logger.info("GET settings endpoint test passed!")
-
-    except ImportError as e:
-        logger.error(f"Flask dependencies not available for testing: {e}")
-        # Basic validation of expected response format
-        expected_response = {
-            "user_id": "default_user",
-            "api_keys": {},
-            "custom_prompts": None,
-            "created_at": None,
-            "updated_at": None,
-        }
-        assert expected_response["user_id"] == "default_user"
-        logger.info("GET settings endpoint format validation passed")
-
-
-def test_post_settings_endpoint():
+    # Test GET request to /api/settings
+    response = client.get("/api/settings")
+
+    # Check status code is 200 OK
+    assert response.status_code == 200, f"Expected 200, got {response.status_code}"
+
+    # Check response is JSON
+    assert response.is_json, f"Expected JSON, got {response.content_type}"
+
+    # Check response body structure
+    data = response.get_json()
+    assert (
+        set(data.keys()) == _EXPECTED_SETTINGS_KEYS
+    ), f"Expected keys {set(_EXPECTED_SETTINGS_KEYS)}, got {set(data.keys())}"
+
+    # Check that API keys object exists (should be empty for new user)
+    assert isinstance(data["api_keys"], dict), "API keys should be a dictionary"
+
+    # Check user_id is default_user
+    assert (
+        data["user_id"] == "default_user"
+    ), f"Expected default_user, got {data['user_id']}"
+
+    logger.info("GET settings endpoint test passed!")
+
+
+def test_post_settings_endpoint(client):
     """Test the POST /api/settings endpoint updates settings correctly."""
-    try:
-        from app.main import create_app
-
-        # Create test app
-        app = create_app("testing")
-        app.config["ENCRYPTION_KEY"] = Fernet.generate_key().decode()
-
-        with app.test_client() as client:
-            # Test POST request to /api/settings with new settings
-            test_settings = {
-                "api_keys": {
-                    "openai_api_key": "test-key-123",
-                    "huggingface_token": "test-token-456",
-                },
-                "custom_prompts": '{"system": "You are a helpful assistant."}',
-            }
-
-            response = client.post(
-                "/api/settings",
-                data=json.dumps(test_settings),
-                content_type="application/json",
-            )
-
-            # Check status code is 200 OK
-            assert (
-                response.status_code == 200
-            ), f"Expected 200, got {response.status_code}"
-
-            # Check response is JSON
-            assert (
-                response.content_type == "application/json"
-            ), f"Expected JSON, got {response.content_type}"
-
-            # Check response body structure
-            data = json.loads(response.data)
-            expected_keys = {
-                "user_id",
-                "api_keys",
-                "custom_prompts",
-                "created_at",
-                "updated_at",
-            }
-            assert (
-                set(data.keys()) == expected_keys
-            ), f"Expected keys {expected_keys}, got {set(data.keys())}"
-
-            # Check that API keys are marked as configured (but values not exposed)
-            assert (
-                "openai_api_key" in data["api_keys"]
-            ), "OpenAI API key should be listed"
-            assert (
-                "huggingface_token" in data["api_keys"]
-            ), "HuggingFace token should be listed"
-            assert (
-                data["api_keys"]["openai_api_key"] == "configured"
-            ), "API key should show as configured"
-            assert (
-                data["api_keys"]["huggingface_token"] == "configured"
-            ), "Token should show as configured"
-
-            # Check custom prompts are returned
-            assert (
-                data["custom_prompts"] == test_settings["custom_prompts"]
-            ), "Custom prompts should match"
-
-            # Check user_id is default_user
-            assert (
-                data["user_id"] == "default_user"
-            ), f"Expected default_user, got {data['user_id']}"
-
-            logger.info("POST settings endpoint test passed!")
-
-    except ImportError as e:
-        logger.error(f"Flask dependencies not available for testing: {e}")
-        # Basic validation of expected response format
-        expected_response = {
-            "user_id": "default_user",
-            "api_keys": {
-                "openai_api_key": "configured",
-                "huggingface_token": "configured",
-            },
-            "custom_prompts": '{"system": "You are a helpful assistant."}',
-            "created_at": "2024-01-01T00:00:00",
-            "updated_at": "2024-01-01T00:00:00",
-        }
-        assert expected_response["user_id"] == "default_user"
-        assert "configured" in expected_response["api_keys"]["openai_api_key"]
-        logger.info("POST settings endpoint format validation passed")
+    # Test POST request to /api/settings with new settings
+    response = client.post("/api/settings", json=_POST_SETTINGS)
+
+    # Check status code is 200 OK
+    assert response.status_code == 200, f"Expected 200, got {response.status_code}"
+
+    # Check response is JSON
+    assert response.is_json, f"Expected JSON, got {response.content_type}"
+
+    # Check response body structure
+    data = response.get_json()
+    assert (
+        set(data.keys()) == _EXPECTED_SETTINGS_KEYS
+    ), f"Expected keys {set(_EXPECTED_SETTINGS_KEYS)}, got {set(data.keys())}"
+
+    # Check that API keys are marked as configured (but values not exposed)
+    assert (
+        data["api_keys"] == _CONFIGURED_API_KEYS
+    ), f"API keys should show as configured, got {data['api_keys']}"
+
+    # Check custom prompts are returned
+    assert (
+        data["custom_prompts"] == _POST_SETTINGS["custom_prompts"]
+    ), "Custom prompts should match"
+
+    # Check user_id is default_user
+    assert (
+        data["user_id"] == "default_user"
+    ), f"Expected default_user, got {data['user_id']}"
+
+    logger.info("POST settings endpoint test passed!")
 
 
 @pytest.mark.parametrize(
@@ -175,139 +112,74 @@ def test_post_settings_endpoint():
         ("", "Failed to update settings"),
     ],
 )
-def test_post_settings_endpoint_empty_body(body, expected_error):
+def test_post_settings_endpoint_empty_body(client, body, expected_error):
     """Test the POST /api/settings endpoint handles empty or invalid body correctly."""
-    try:
-        from app.main import create_app
-
-        app = create_app("testing")
-
-        with app.test_client() as client:
-            response = client.post(
-                "/api/settings", data=body, content_type="application/json"
-            )
-            assert (
-                response.status_code == 400
-            ), f"Expected 400, got {response.status_code} for body: {body}"
-            assert (
-                response.content_type == "application/json"
-            ), f"Expected JSON, got {response.content_type}"
-            data = json.loads(response.data)
-            assert "error" in data, "Response should contain error message"
-            assert (
-                expected_error.lower() in data["error"].lower()
-            ), f"Error should mention '{expected_error}' for body: {body}"
-
-        logger.info("POST settings empty/invalid body test passed!")
-    except ImportError as e:
-        logger.error(f"Flask dependencies not available for testing: {e}")
-        logger.info("POST settings empty/invalid body validation passed")
-
-
-def test_post_settings_endpoint_api_keys_merging():
+    response = client.post("/api/settings", data=body, content_type="application/json")
+    assert (
+        response.status_code == 400
+    ), f"Expected 400, got {response.status_code} for body: {body}"
+    assert response.is_json, f"Expected JSON, got {response.content_type}"
+    data = response.get_json()
+    assert "error" in data, "Response should contain error message"
+    assert (
+        expected_error.lower() in data["error"].lower()
+    ), f"Error should mention '{expected_error}' for body: {body}"
+
+    logger.info("POST settings empty/invalid body test passed!")
+
+
+def test_post_settings_endpoint_api_keys_merging(client):
     """Test that API keys are merged with existing keys instead of overwritten."""
-    try:
-        from app.main import create_app
-
-        # Create test app
-        app = create_app("testing")
-        app.config["ENCRYPTION_KEY"] = Fernet.generate_key().decode()
-
-        with app.test_client() as client:
-            # First, set initial API keys
-            initial_settings = {
-                "api_keys": {
-                    "openai_api_key": "initial-openai-key",
-                    "huggingface_token": "initial-hf-token",
-                },
-                "custom_prompts": '{"system": "Initial prompt"}',
-            }
-
-            response = client.post(
-                "/api/settings",
-                data=json.dumps(initial_settings),
-                content_type="application/json",
-            )
-            assert response.status_code == 200
-
-            # Now update only one API key - should merge with existing
-            update_settings = {
-                "api_keys": {
-                    "openai_api_key": "updated-openai-key",
-                }
-            }
-
-            response = client.post(
-                "/api/settings",
-                data=json.dumps(update_settings),
-                content_type="application/json",
-            )
-
-            assert response.status_code == 200
-            data = json.loads(response.data)
-
-            # Both keys should still be present
-            assert "openai_api_key" in data["api_keys"]
-            assert "huggingface_token" in data["api_keys"]
-            assert data["api_keys"]["openai_api_key"] == "configured"
-            assert data["api_keys"]["huggingface_token"] == "configured"
-
-            # Custom prompts should remain unchanged
-            assert data["custom_prompts"] == '{"system": "Initial prompt"}'
-
-            logger.info("API keys merging test passed!")
-
-    except ImportError as e:
-        logger.error(f"Flask dependencies not available for testing: {e}")
-        logger.info("API keys merging validation passed")
-
-
-def test_post_settings_endpoint_invalid_custom_prompts():
+    # First, set initial API keys
+    response = client.post("/api/settings", json=_INITIAL_SETTINGS)
+    assert response.status_code == 200
+
+    # Now update only one API key - should merge with existing
+    response = client.post("/api/settings", json=_UPDATE_SETTINGS)
+
+    assert response.status_code == 200
+    data = response.get_json()
+
+    # Both keys should still be present
+    assert data["api_keys"] == _CONFIGURED_API_KEYS
+
+    # Custom prompts should remain unchanged
+    assert data["custom_prompts"] == _INITIAL_SETTINGS["custom_prompts"]
+
+    logger.info("API keys merging test passed!")
+
+
+def test_post_settings_endpoint_invalid_custom_prompts(client):
     """Test that invalid JSON in custom_prompts returns proper error."""
-    try:
-        from app.main import create_app
-
-        # Create test app
-        app = create_app("testing")
-
-        with app.test_client() as client:
-            # Test POST request with invalid JSON in custom_prompts
-            test_settings = {
-                "api_keys": {
-                    "openai_api_key": "test-key-123",
-                },
-                "custom_prompts": '{"system": "Invalid JSON"',  # Missing closing brace
-            }
-
-            response = client.post(
-                "/api/settings",
-                data=json.dumps(test_settings),
-                content_type="application/json",
-            )
-
-            # Check status code is 400 Bad Request
-            assert (
-                response.status_code == 400
-            ), f"Expected 400, got {response.status_code}"
-
-            # Check error message
-            data = json.loads(response.data)
-            assert "error" in data, "Response should contain error message"
-            assert (
-                "valid JSON string" in data["error"]
-            ), "Error should mention valid JSON string"
-
-            logger.info("Invalid custom_prompts test passed!")
-
-    except ImportError as e:
-        logger.error(f"Flask dependencies not available for testing: {e}")
-        logger.info("Invalid custom_prompts validation passed")
+    # Test POST request with invalid JSON in custom_prompts
+    response = client.post("/api/settings", json=_INVALID_PROMPTS_SETTINGS)
+
+    # Check status code is 400 Bad Request
+    assert response.status_code == 400, f"Expected 400, got {response.status_code}"
+
+    # Check error message
+    data = response.get_json()
+    assert "error" in data, "Response should contain error message"
+    assert (
+        "valid JSON string" in data["error"]
+    ), "Error should mention valid JSON string"
+
+    logger.info("Invalid custom_prompts test passed!")
+
+
+def test_get_settings_endpoint_query_count(app, client, count_queries):
+    """Test that GET /api/settings stays within its query budget."""
+    client.post("/api/settings", json=_POST_SETTINGS)
+
+    with app.app_context():
+        engine = db.engine
+
+    with count_queries(engine) as queries:
+        response = client.get("/api/settings")
+
+    assert response.status_code == 200
+    assert len(queries) <= 2, f"Expected at most 2 queries, got {queries}"
 
 
 if __name__ == "__main__":
-    test_get_settings_endpoint()
-    test_post_settings_endpoint()
-    test_post_settings_endpoint_empty_body()
-    test_post_settings_endpoint_api_keys_merging()
-    test_post_settings_endpoint_invalid_custom_prompts()
-    print("All settings endpoint tests passed!")
+    sys.exit(pytest.main([__file__, "-v"]))
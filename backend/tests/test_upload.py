@@ -3,41 +3,11 @@ Tests for PDF upload endpoint functionality.
 """
 
 import io
-import json
-import time
-from unittest.mock import patch
+import os
+import tracemalloc
+from unittest.mock import MagicMock, patch
 
-import pytest
-
-from app.main import create_app
-
-
-@pytest.fixture
-def app():
-    """Create test Flask application."""
-    app = create_app("testing")
-    return app
-
-
-@pytest.fixture
-def client(app):
-    """Create test client."""
-    return app.test_client()
-
-
-@pytest.fixture
-def sample_pdf():
-    """Create a sample PDF file for testing."""
-    # Create a simple PDF-like content for testing
-    pdf_content = (
-        b"%PDF-1.4\n1 0 obj\n<<\n/Type /Catalog\n/Pages 2 0 R\n>>\nendobj\n"
-        b"2 0 obj\n<<\n/Type /Pages\n/Kids [3 0 R]\n/Count 1\n>>\nendobj\n"
-        b"3 0 obj\n<<\n/Type /Page\n/Parent 2 0 R\n/MediaBox [0 0 612 792]\n"
-        b">>\nendobj\nxref\n0 4\n0000000000 65535 f \n0000000009 00000 n \n"
-        b"0000000058 00000 n \n0000000115 00000 n \ntrailer\n<<\n/Size 4\n"
-        b"/Root 1 0 R\n>>\nstartxref\n198\n%%EOF"
-    )
-    return pdf_content
+from app.api.routes import _SAFE_FILENAME, _is_allowed_file
 
 
 class TestUploadEndpoint:
@@ -47,7 +17,7 @@ class TestUploadEndpoint:
         """Test upload endpoint with no file provided."""
         response = client.post("/api/data_source/upload")
         assert response.status_code == 400
-        data = json.loads(response.data)
+        data = response.get_json()
         assert data["error"] == "No file provided"
 
     def test_upload_endpoint_empty_filename(self, client):
@@ -57,7 +27,7 @@ class TestUploadEndpoint:
             "/api/data_source/upload", data=data, content_type="multipart/form-data"
         )
         assert response.status_code == 400
-        data = json.loads(response.data)
+        data = response.get_json()
         assert data["error"] == "No file selected"
 
     def test_upload_endpoint_invalid_file_type(self, client):
@@ -67,7 +37,7 @@ class TestUploadEndpoint:
             "/api/data_source/upload", data=data, content_type="multipart/form-data"
         )
         assert response.status_code == 400
-        data = json.loads(response.data)
+        data = response.get_json()
         assert "Invalid file type" in data["error"]
 
     @patch("app.api.routes.data_ingestion_service.process_source")
@@ -81,7 +51,7 @@ class TestUploadEndpoint:
         )
 
         assert response.status_code == 202
-        response_data = json.loads(response.data)
+        response_data = response.get_json()
         assert "task_id" in response_data
         assert response_data["status"] == "processing"
         assert response_data["filename"] == "test.pdf"
@@ -98,19 +68,16 @@ class TestUploadEndpoint:
         )
 
         assert response.status_code == 202
-        response_data = json.loads(response.data)
+        response_data = response.get_json()
         task_id = response_data["task_id"]
 
-        # Wait a bit for background processing
-        time.sleep(0.1)
-
+        # Testing config runs ingestion inline, so the status is already final
         # Check task status
         status_response = client.get(f"/api/data_source/upload/status/{task_id}")
         assert status_response.status_code == 200
-        status_data = json.loads(status_response.data)
+        status_data = status_response.get_json()
         assert status_data["task_id"] == task_id
-        # Status might be "processing" or "completed" depending on timing
-        assert status_data["status"] in ["processing", "completed"]
+        assert status_data["status"] == "completed"
 
     @patch("app.api.routes.data_ingestion_service.process_source")
     def test_upload_endpoint_processing_failure(self, mock_process, client, sample_pdf):
@@ -123,31 +90,27 @@ class TestUploadEndpoint:
         )
 
         assert response.status_code == 202
-        response_data = json.loads(response.data)
+        response_data = response.get_json()
         task_id = response_data["task_id"]
 
-        # Wait for background processing to complete
-        time.sleep(0.2)
-
+        # Testing config runs ingestion inline, so the status is already final
         # Check task status
         status_response = client.get(f"/api/data_source/upload/status/{task_id}")
         assert status_response.status_code == 200
-        status_data = json.loads(status_response.data)
+        status_data = status_response.get_json()
         assert status_data["task_id"] == task_id
         # Should be failed since mock returns False
-        assert status_data["status"] in ["processing", "failed"]
+        assert status_data["status"] == "failed"
 
     def test_upload_status_endpoint_not_found(self, client):
         """Test status endpoint with non-existent task ID."""
         response = client.get("/api/data_source/upload/status/nonexistent")
         assert response.status_code == 404
-        data = json.loads(response.data)
+        data = response.get_json()
         assert data["error"] == "Task not found"
 
     def test_is_allowed_file_function(self):
         """Test the file extension validation function."""
-        from app.api.routes import _is_allowed_file
-
         assert _is_allowed_file("test.pdf") is True
         assert _is_allowed_file("TEST.PDF") is True
         assert _is_allowed_file("document.txt") is False
@@ -155,6 +118,12 @@ class TestUploadEndpoint:
         assert _is_allowed_file("noextension") is False
         assert _is_allowed_file("") is False
 
+    def test_safe_filename_rejects_names_secure_filename_changes(self):
+        """Test that the sanitizer fast path only accepts unchanged names."""
+        assert _SAFE_FILENAME.fullmatch("Report_2024-v1.2.pdf")
+        for filename in ("report.pdf_", "a-.pdf.", "x__", "_report.pdf"):
+            assert _SAFE_FILENAME.fullmatch(filename) is None
+
     @patch("app.api.routes.data_ingestion_service.process_source")
     def test_upload_with_special_characters_filename(
         self, mock_process, client, sample_pdf
@@ -170,11 +139,28 @@ class TestUploadEndpoint:
         )
 
         assert response.status_code == 202
-        response_data = json.loads(response.data)
+        response_data = response.get_json()
         # Should have a sanitized filename
         assert "task_id" in response_data
         assert response_data["status"] == "processing"
 
+    @patch("app.api.routes.data_ingestion_service.process_source")
+    @patch("app.api.routes.secure_filename")
+    def test_upload_with_plain_filename_skips_sanitizer(
+        self, mock_secure, mock_process, client, sample_pdf
+    ):
+        """Test that already-safe filenames are used without secure_filename."""
+        mock_process.return_value = True
+
+        data = {"file": (io.BytesIO(sample_pdf), "Report_2024-v1.2.pdf")}
+        response = client.post(
+            "/api/data_source/upload", data=data, content_type="multipart/form-data"
+        )
+
+        assert response.status_code == 202
+        assert response.get_json()["filename"] == "Report_2024-v1.2.pdf"
+        mock_secure.assert_not_called()
+
     @patch("app.api.routes.data_ingestion_service.process_source")
     @patch("app.api.routes.secure_filename")
     def test_upload_with_malicious_filename(
@@ -193,7 +179,7 @@ class TestUploadEndpoint:
         )
 
         assert response.status_code == 202
-        response_data = json.loads(response.data)
+        response_data = response.get_json()
         # Should generate a safe filename when secure_filename returns empty
         assert response_data["filename"].startswith("upload_")
         assert response_data["filename"].endswith(".pdf")
@@ -211,7 +197,77 @@ class TestUploadEndpoint:
         )
 
         assert response.status_code == 202
-        response_data = json.loads(response.data)
+        response_data = response.get_json()
         assert "task_id" in response_data
         assert response_data["status"] == "processing"
         assert response_data["filename"] == "large_test.pdf"
+
+    def test_upload_queues_on_ingestion_executor(
+        self, app, client, sample_pdf, monkeypatch
+    ):
+        """Test that uploads are handed to the worker pool when not eager."""
+        executor = MagicMock()
+        monkeypatch.setitem(app.config, "INGESTION_TASKS_EAGER", False)
+        monkeypatch.setitem(app.extensions, "ingestion_executor", executor)
+
+        data = {"file": (io.BytesIO(sample_pdf), "test.pdf")}
+        response = client.post(
+            "/api/data_source/upload", data=data, content_type="multipart/form-data"
+        )
+
+        assert response.status_code == 202
+        task_id = response.get_json()["task_id"]
+        executor.submit.assert_called_once()
+        _, queued_task_id, temp_file_path, _ = executor.submit.call_args.args
+        assert queued_task_id == task_id
+        os.unlink(temp_file_path)
+
+        status_response = client.get(f"/api/data_source/upload/status/{task_id}")
+        assert status_response.get_json()["status"] == "queued"
+
+    def test_large_upload_is_not_buffered_in_memory(self, app, client, monkeypatch):
+        """Test that a large upload is spooled to disk rather than held in RAM."""
+        executor = MagicMock()
+        monkeypatch.setitem(app.config, "INGESTION_TASKS_EAGER", False)
+        monkeypatch.setitem(app.extensions, "ingestion_executor", executor)
+        content = os.urandom(8 * 1024 * 1024)
+        data = {"file": (io.BytesIO(content), "large_test.pdf")}
+
+        tracemalloc.start()
+        try:
+            with patch("app.api.routes.os.link", wraps=os.link) as mock_link:
+                response = client.post(
+                    "/api/data_source/upload",
+                    data=data,
+                    content_type="multipart/form-data",
+                )
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        assert response.status_code == 202
+        assert peak < len(content) // 4
+        mock_link.assert_called_once()
+        temp_file_path = executor.submit.call_args.args[2]
+        with open(temp_file_path, "rb") as saved:
+            assert saved.read() == content
+        os.unlink(temp_file_path)
+
+    def test_small_upload_stays_in_memory(self, app, client, sample_pdf, monkeypatch):
+        """Test that a small upload is copied from memory, not hard-linked."""
+        executor = MagicMock()
+        monkeypatch.setitem(app.config, "INGESTION_TASKS_EAGER", False)
+        monkeypatch.setitem(app.extensions, "ingestion_executor", executor)
+        data = {"file": (io.BytesIO(sample_pdf), "small_test.pdf")}
+
+        with patch("app.api.routes.os.link", wraps=os.link) as mock_link:
+            response = client.post(
+                "/api/data_source/upload", data=data, content_type="multipart/form-data"
+            )
+
+        assert response.status_code == 202
+        mock_link.assert_not_called()
+        temp_file_path = executor.submit.call_args.args[2]
+        with open(temp_file_path, "rb") as saved:
+            assert saved.read() == sample_pdf
+        os.unlink(temp_file_path)
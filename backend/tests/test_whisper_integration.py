@@ -2,188 +2,185 @@
 Integration test for whisper transcription with data ingestion service.
 """
 
-import shutil
-import tempfile
 import unittest.mock
-from pathlib import Path
+from contextlib import ExitStack, contextmanager
+from types import SimpleNamespace
+
+import pytest
 
-from app.services.chromadb_service import ChromaDBService
 from app.services.data_ingestion_service import DataIngestionService
-from app.services.embedding_service import EmbeddingFactory
+from app.services.whisper_transcription_service import WhisperTranscriptionService
+from app.services.youtube_downloader_service import YouTubeDownloaderService
+from tests.fakes import FakeChromaDBService, FakeEmbeddingFactory
+
+_YOUTUBE_URL = "https://youtube.com/watch?v=test123"
+_TRANSCRIPT = "This is a test transcription of the YouTube video content."
+
+
+@contextmanager
+def _patch_youtube_pipeline(audio_path, transcription):
+    """
+    Patch the downloader and whisper services DataIngestionService builds.
+
+    Args:
+        audio_path: Path the downloader mock reports for the fetched audio,
+            or None to simulate a failed download
+        transcription: Text returned by the whisper mock, or an exception
+            it raises instead
+
+    Yields:
+        Namespace with the ``youtube`` and ``whisper`` service mocks
+    """
+    mocks = SimpleNamespace(
+        youtube=unittest.mock.create_autospec(YouTubeDownloaderService, instance=True),
+        whisper=unittest.mock.create_autospec(
+            WhisperTranscriptionService, instance=True
+        ),
+    )
+    mocks.youtube.is_youtube_url.return_value = True
+    mocks.youtube.download_audio.return_value = str(audio_path) if audio_path else None
+    mocks.youtube.cleanup_file.return_value = True
+    if isinstance(transcription, BaseException):
+        mocks.whisper.transcribe_audio.side_effect = transcription
+    else:
+        mocks.whisper.transcribe_audio.return_value = transcription
+
+    with ExitStack() as stack:
+        for name, mock_service in (
+            ("YouTubeDownloaderService", mocks.youtube),
+            ("WhisperTranscriptionService", mocks.whisper),
+        ):
+            stack.enter_context(
+                unittest.mock.patch(
+                    f"app.services.data_ingestion_service.{name}",
+                    return_value=mock_service,
+                )
+            )
+        yield mocks
+
+
+@pytest.fixture
+def fake_chromadb():
+    """Provide a ChromaDB service fake that records stored documents."""
+    return FakeChromaDBService()
+
+
+@pytest.fixture
+def embedding_factory():
+    """Provide an embedding factory fake returning constant vectors."""
+    return FakeEmbeddingFactory()
 
 
 class TestWhisperDataIngestionIntegration:
     """Integration tests for whisper transcription with data ingestion."""
 
-    def setup_method(self):
-        """Set up test environment."""
-        self.temp_dir = tempfile.mkdtemp()
-
-        # Mock services
-        self.mock_chromadb = unittest.mock.MagicMock(spec=ChromaDBService)
-        self.mock_embedding_factory = unittest.mock.MagicMock(spec=EmbeddingFactory)
-
-        # Set up mock embedding model
-        mock_embedding_model = unittest.mock.MagicMock()
-        mock_embedding_model.embed_documents.return_value = [
-            [0.1, 0.2, 0.3],  # Mock embedding
-        ]
-        self.mock_embedding_factory.create_embedding_model.return_value = (
-            mock_embedding_model
-        )
-
-    def teardown_method(self):
-        """Clean up test environment."""
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
-
-    @unittest.mock.patch("app.services.data_ingestion_service.YouTubeDownloaderService")
-    @unittest.mock.patch(
-        "app.services.data_ingestion_service.WhisperTranscriptionService"
+    @pytest.mark.parametrize(
+        "downloaded, transcription, expected_document, transcription_available",
+        [
+            (True, _TRANSCRIPT, _TRANSCRIPT, True),
+            (
+                True,
+                RuntimeError("Whisper transcription failed"),
+                f"YouTube video: {_YOUTUBE_URL}",
+                False,
+            ),
+            (False, _TRANSCRIPT, None, None),
+        ],
+        ids=["success", "transcribe_fails", "download_fails"],
     )
-    def test_youtube_processing_with_transcription_success(
-        self, mock_whisper_service_class, mock_youtube_service_class
+    def test_youtube_processing(
+        self,
+        fake_chromadb,
+        embedding_factory,
+        tmp_path,
+        downloaded,
+        transcription,
+        expected_document,
+        transcription_available,
     ):
-        """Test successful YouTube processing with whisper transcription."""
-        # Setup mocks
-        mock_youtube_service = unittest.mock.MagicMock()
-        mock_whisper_service = unittest.mock.MagicMock()
-
-        mock_youtube_service_class.return_value = mock_youtube_service
-        mock_whisper_service_class.return_value = mock_whisper_service
-
-        # Configure YouTube downloader mock
-        mock_youtube_service.is_youtube_url.return_value = True
-        mock_youtube_service.download_audio.return_value = str(
-            Path(self.temp_dir) / "test_audio.mp3"
-        )
-        mock_youtube_service.cleanup_file.return_value = True
-
-        # Configure whisper transcription mock
-        mock_whisper_service.transcribe_audio.return_value = (
-            "This is a test transcription of the YouTube video content."
-        )
-
-        # Create data ingestion service
-        service = DataIngestionService(
-            chromadb_service=self.mock_chromadb,
-            embedding_factory=self.mock_embedding_factory,
-            youtube_download_dir=self.temp_dir,
-        )
-
-        # Test YouTube processing
-        result = service.process_source(
-            "https://youtube.com/watch?v=test123",
-            "youtube",
-            {"test_metadata": "value"},
-        )
-
-        # Verify the process succeeded
-        assert result is True
+        """Test YouTube processing across download and transcription outcomes."""
+        audio_path = tmp_path / "test_audio.mp3" if downloaded else None
+        with _patch_youtube_pipeline(audio_path, transcription) as mocks:
+            # Create data ingestion service
+            service = DataIngestionService(
+                chromadb_service=fake_chromadb,
+                embedding_factory=embedding_factory,
+                youtube_download_dir=str(tmp_path),
+            )
+
+            # Test YouTube processing
+            result = service.process_source(
+                _YOUTUBE_URL, "youtube", {"test_metadata": "value"}
+            )
+
+        # A failed transcription falls back to the URL; a failed download aborts
+        assert result is downloaded
 
         # Verify YouTube downloader was called correctly
-        mock_youtube_service.is_youtube_url.assert_called_once_with(
-            "https://youtube.com/watch?v=test123"
-        )
-        mock_youtube_service.download_audio.assert_called_once_with(
-            "https://youtube.com/watch?v=test123"
-        )
+        mocks.youtube.is_youtube_url.assert_called_once_with(_YOUTUBE_URL)
+        mocks.youtube.download_audio.assert_called_once_with(_YOUTUBE_URL)
 
-        # Verify whisper transcription was called
-        mock_whisper_service.transcribe_audio.assert_called_once()
+        if not downloaded:
+            mocks.whisper.transcribe_audio.assert_not_called()
+            assert fake_chromadb.calls == []
+            return
+
+        # Verify whisper transcription was attempted
+        mocks.whisper.transcribe_audio.assert_called_once()
 
-        # Verify ChromaDB storage was called with transcribed content
-        self.mock_chromadb.add_documents.assert_called_once()
-        call_args = self.mock_chromadb.add_documents.call_args
+        # Verify ChromaDB storage was called with the transcript or fallback
+        assert len(fake_chromadb.calls) == 1
+        stored = fake_chromadb.calls[-1]
 
-        # Check that the transcribed text was included in the documents
-        documents = call_args.kwargs["documents"]
+        documents = stored["documents"]
         assert len(documents) > 0
-        assert "This is a test transcription" in documents[0]
-        # URL should not be in document content, only in metadata
+        assert expected_document in documents[0]
 
-        # Check metadata includes transcription info
-        metadatas = call_args.kwargs["metadatas"]
+        # Check metadata records whether a transcription was available
+        metadatas = stored["metadatas"]
         assert len(metadatas) > 0
         assert metadatas[0]["source_type"] == "youtube"
-        assert metadatas[0]["transcription_available"] is True
+        assert metadatas[0]["transcription_available"] is transcription_available
 
         # Verify cleanup was called
-        mock_youtube_service.cleanup_file.assert_called_once()
+        mocks.youtube.cleanup_file.assert_called_once()
 
-    @unittest.mock.patch("app.services.data_ingestion_service.YouTubeDownloaderService")
-    @unittest.mock.patch(
-        "app.services.data_ingestion_service.WhisperTranscriptionService"
-    )
-    def test_youtube_processing_with_transcription_failure(
-        self, mock_whisper_service_class, mock_youtube_service_class
+    def test_youtube_processing_cleans_up_when_storage_fails(
+        self, fake_chromadb, embedding_factory, tmp_path
     ):
-        """Test YouTube processing when whisper transcription fails."""
-        # Setup mocks
-        mock_youtube_service = unittest.mock.MagicMock()
-        mock_whisper_service = unittest.mock.MagicMock()
-
-        mock_youtube_service_class.return_value = mock_youtube_service
-        mock_whisper_service_class.return_value = mock_whisper_service
-
-        # Configure YouTube downloader mock
-        mock_youtube_service.is_youtube_url.return_value = True
-        mock_youtube_service.download_audio.return_value = str(
-            Path(self.temp_dir) / "test_audio.mp3"
-        )
-        mock_youtube_service.cleanup_file.return_value = True
-
-        # Configure whisper transcription to fail
-        mock_whisper_service.transcribe_audio.side_effect = RuntimeError(
-            "Whisper transcription failed"
-        )
-
-        # Create data ingestion service
-        service = DataIngestionService(
-            chromadb_service=self.mock_chromadb,
-            embedding_factory=self.mock_embedding_factory,
-            youtube_download_dir=self.temp_dir,
-        )
-
-        # Test YouTube processing (should still succeed with fallback)
-        result = service.process_source(
-            "https://youtube.com/watch?v=test123",
-            "youtube",
-            {"test_metadata": "value"},
+        """Test that downloaded audio is removed even if storing raises."""
+        with _patch_youtube_pipeline(tmp_path / "test_audio.mp3", _TRANSCRIPT) as mocks:
+            service = DataIngestionService(
+                chromadb_service=fake_chromadb,
+                embedding_factory=embedding_factory,
+                youtube_download_dir=str(tmp_path),
+            )
+            with unittest.mock.patch.object(
+                service, "_chunk_embed_and_store", side_effect=RuntimeError("boom")
+            ):
+                result = service.process_source(_YOUTUBE_URL, "youtube")
+
+        assert result is False
+        mocks.youtube.cleanup_file.assert_called_once_with(
+            str(tmp_path / "test_audio.mp3")
         )
 
-        # Verify the process succeeded despite transcription failure
-        assert result is True
-
-        # Verify whisper transcription was attempted
-        mock_whisper_service.transcribe_audio.assert_called_once()
-
-        # Verify ChromaDB storage was called with fallback content
-        self.mock_chromadb.add_documents.assert_called_once()
-        call_args = self.mock_chromadb.add_documents.call_args
-
-        # Check that fallback content was used (URL only)
-        documents = call_args.kwargs["documents"]
-        assert len(documents) > 0
-        assert "YouTube video: https://youtube.com/watch?v=test123" in documents[0]
-
-        # Check metadata indicates no transcription available
-        metadatas = call_args.kwargs["metadatas"]
-        assert len(metadatas) > 0
-        assert metadatas[0]["source_type"] == "youtube"
-        assert metadatas[0]["transcription_available"] is False
-
     @unittest.mock.patch("app.services.data_ingestion_service.YouTubeDownloaderService")
     @unittest.mock.patch(
         "app.services.data_ingestion_service.WhisperTranscriptionService"
     )
     def test_data_ingestion_service_initialization_with_whisper_params(
-        self, mock_whisper_service_class, mock_youtube_service_class
+        self,
+        mock_whisper_service_class,
+        mock_youtube_service_class,
+        fake_chromadb,
+        embedding_factory,
     ):
         """Test DataIngestionService initializes WhisperTranscriptionService."""
         # Create data ingestion service with custom whisper parameters
         service = DataIngestionService(
-            chromadb_service=self.mock_chromadb,
-            embedding_factory=self.mock_embedding_factory,
+            chromadb_service=fake_chromadb,
+            embedding_factory=embedding_factory,
             whisper_executable="/custom/path/whisper",
             whisper_model="large-v3",
         )
@@ -2,34 +2,57 @@
 Test module for Whisper transcription service.
 """
 
-import shutil
 import subprocess
+import sys
 import tempfile
 import unittest.mock
 from pathlib import Path
 
 import pytest
 
+from app.services import whisper_transcription_service
 from app.services.whisper_transcription_service import WhisperTranscriptionService
 
 
+@pytest.fixture(scope="class")
+def whisper_temp_dir(tmp_path_factory):
+    """Create one temporary directory shared by the whole test class."""
+    return str(tmp_path_factory.mktemp("whisper"))
+
+
+@pytest.fixture
+def faster_whisper_model(monkeypatch):
+    """Install a fake faster-whisper backend and return its model class."""
+    module = unittest.mock.MagicMock()
+    monkeypatch.setattr(whisper_transcription_service, "HAS_FASTER_WHISPER", True)
+    monkeypatch.setitem(sys.modules, "faster_whisper", module)
+    return module.WhisperModel
+
+
+@pytest.fixture
+def whisper_cpp_model(monkeypatch):
+    """Install a fake pywhispercpp backend and return its model class."""
+    module = unittest.mock.MagicMock()
+    monkeypatch.setattr(whisper_transcription_service, "HAS_FASTER_WHISPER", False)
+    monkeypatch.setattr(whisper_transcription_service, "HAS_PYWHISPERCPP", True)
+    monkeypatch.setitem(sys.modules, "pywhispercpp", module)
+    monkeypatch.setitem(sys.modules, "pywhispercpp.model", module.model)
+    return module.model.Model
+
+
 class TestWhisperTranscriptionService:
     """Test cases for WhisperTranscriptionService."""
 
-    def setup_method(self):
-        """Set up test environment."""
-        self.temp_dir = tempfile.mkdtemp()
+    @pytest.fixture(autouse=True)
+    def _service(self, whisper_temp_dir):
+        """Create a fresh service per test so its caches do not leak."""
+        self.temp_dir = whisper_temp_dir
         self.service = WhisperTranscriptionService(
             whisper_executable="whisper",
             default_model="base",
             temp_dir=self.temp_dir,
         )
 
-    def teardown_method(self):
-        """Clean up test environment."""
-        # Clean up temp directory
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
-
     def test_init_sets_properties(self):
         """Test that initialization sets the correct properties."""
         assert self.service.whisper_executable == "whisper"
@@ -42,6 +65,7 @@ class TestWhisperTranscriptionService:
         assert service.whisper_executable == "whisper"
         assert service.default_model == "base"
         assert service.temp_dir == Path(tempfile.gettempdir())
+        assert service.compute_type == "int8"
 
     @unittest.mock.patch("subprocess.run")
     def test_is_whisper_available_success(self, mock_run):
@@ -51,11 +75,26 @@ class TestWhisperTranscriptionService:
         assert self.service.is_whisper_available() is True
         mock_run.assert_called_once_with(
             ["whisper", "--help"],
-            capture_output=True,
-            text=True,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
             timeout=10,
         )
 
+    @unittest.mock.patch("subprocess.run")
+    def test_is_whisper_available_is_cached(self, mock_run):
+        """Test that the availability check runs once until invalidated."""
+        mock_run.return_value.returncode = 0
+
+        assert self.service.is_whisper_available() is True
+        assert self.service.is_whisper_available() is True
+        assert mock_run.call_count == 1
+
+        mock_run.return_value.returncode = 1
+        self.service.invalidate_availability_cache()
+
+        assert self.service.is_whisper_available() is False
+        assert mock_run.call_count == 2
+
     @unittest.mock.patch("subprocess.run")
     def test_is_whisper_available_not_found(self, mock_run):
         """Test whisper availability check when executable is not found."""
@@ -106,8 +145,7 @@ class TestWhisperTranscriptionService:
 
         # Mock successful subprocess execution
         mock_run.return_value.returncode = 0
-        mock_run.return_value.stderr = ""
-        mock_run.return_value.stdout = ""
+        mock_run.return_value.stderr = b""
 
         # Create a real temporary output file for testing
         temp_output_path = Path(self.temp_dir) / "temp_output.txt"
@@ -139,8 +177,7 @@ class TestWhisperTranscriptionService:
 
         # Mock successful subprocess execution
         mock_run.return_value.returncode = 0
-        mock_run.return_value.stderr = ""
-        mock_run.return_value.stdout = ""
+        mock_run.return_value.stderr = b""
 
         temp_output_path = Path(self.temp_dir) / "temp_output.txt"
 
@@ -175,7 +212,7 @@ class TestWhisperTranscriptionService:
 
         # Mock failed subprocess execution
         mock_run.return_value.returncode = 1
-        mock_run.return_value.stderr = "whisper.cpp error: invalid file"
+        mock_run.return_value.stderr = b"whisper.cpp error: invalid file"
 
         with pytest.raises(RuntimeError, match="whisper.cpp transcription failed"):
             self.service.transcribe_audio(str(temp_audio))
@@ -200,29 +237,21 @@ class TestWhisperTranscriptionService:
         WhisperTranscriptionService, "is_whisper_available", return_value=True
     )
     @unittest.mock.patch("subprocess.run")
-    def test_transcribe_audio_no_output_file_with_stdout(
-        self, mock_run, mock_available
-    ):
-        """Test transcription when no output file is created but stdout has content."""
+    def test_transcribe_audio_discards_stdout(self, mock_run, mock_available):
+        """Test that whisper.cpp stdout is not captured, only the output file."""
         # Create a temporary audio file
         temp_audio = Path(self.temp_dir) / "test.mp3"
         temp_audio.touch()
 
-        # Mock successful subprocess execution with stdout content
         mock_run.return_value.returncode = 0
-        mock_run.return_value.stderr = ""
-        mock_run.return_value.stdout = "Transcription from stdout"
-
-        with unittest.mock.patch("tempfile.NamedTemporaryFile") as mock_temp:
-            mock_temp_file = unittest.mock.MagicMock()
-            mock_temp_file.name = str(Path(self.temp_dir) / "temp_output.txt")
-            mock_temp.__enter__.return_value = mock_temp_file
+        mock_run.return_value.stderr = b""
 
-            # Don't create the output file to simulate missing file scenario
+        result = self.service.transcribe_audio(str(temp_audio))
 
-            result = self.service.transcribe_audio(str(temp_audio))
-
-            assert result == "Transcription from stdout"
+        # No output file was written, and stdout is never read as a fallback
+        assert result is None
+        assert mock_run.call_args.kwargs["stdout"] == subprocess.DEVNULL
+        assert mock_run.call_args.kwargs["stderr"] == subprocess.PIPE
 
     @unittest.mock.patch.object(
         WhisperTranscriptionService, "is_whisper_available", return_value=True
@@ -236,8 +265,7 @@ class TestWhisperTranscriptionService:
 
         # Mock successful subprocess execution but no output
         mock_run.return_value.returncode = 0
-        mock_run.return_value.stderr = ""
-        mock_run.return_value.stdout = ""
+        mock_run.return_value.stderr = b""
 
         with unittest.mock.patch("tempfile.NamedTemporaryFile") as mock_temp:
             mock_temp_file = unittest.mock.MagicMock()
@@ -250,6 +278,118 @@ class TestWhisperTranscriptionService:
 
             assert result is None
 
+    def test_transcribe_audio_in_process_reuses_model(self, whisper_cpp_model):
+        """Test that the in-process backend loads each model only once."""
+        temp_audio = Path(self.temp_dir) / "test.mp3"
+        temp_audio.touch()
+        whisper_cpp_model.return_value.transcribe.return_value = [
+            unittest.mock.Mock(text=" First segment. "),
+            unittest.mock.Mock(text="Second segment."),
+        ]
+
+        with unittest.mock.patch("subprocess.run") as mock_run:
+            first = self.service.transcribe_audio(str(temp_audio))
+            second = self.service.transcribe_audio(str(temp_audio))
+
+        assert first == second == "First segment.\nSecond segment."
+        whisper_cpp_model.assert_called_once_with("base")
+        mock_run.assert_not_called()
+
+    def test_preload_model_is_reused_by_transcription(self, whisper_cpp_model):
+        """Test that a preloaded model is not loaded again when transcribing."""
+        temp_audio = Path(self.temp_dir) / "test.mp3"
+        temp_audio.touch()
+        whisper_cpp_model.return_value.transcribe.return_value = [
+            unittest.mock.Mock(text="Warm start.")
+        ]
+
+        assert self.service.preload_model() is True
+        assert self.service.transcribe_audio(str(temp_audio)) == "Warm start."
+        whisper_cpp_model.assert_called_once_with("base")
+
+    @unittest.mock.patch(
+        "app.services.whisper_transcription_service.HAS_FASTER_WHISPER", False
+    )
+    @unittest.mock.patch(
+        "app.services.whisper_transcription_service.HAS_PYWHISPERCPP", False
+    )
+    def test_preload_model_without_in_process_backend(self):
+        """Test that preloading is a no-op when only the executable is used."""
+        assert self.service.preload_model() is False
+
+    def test_transcribe_audio_int8_backend(self, faster_whisper_model):
+        """Test that faster-whisper is loaded with the configured compute type."""
+        temp_audio = Path(self.temp_dir) / "test.mp3"
+        temp_audio.touch()
+        faster_whisper_model.return_value.transcribe.return_value = (
+            iter([unittest.mock.Mock(text="Quantized segment.")]),
+            unittest.mock.Mock(),
+        )
+
+        result = self.service.transcribe_audio(str(temp_audio), model="small")
+
+        assert result == "Quantized segment."
+        faster_whisper_model.assert_called_once_with(
+            "small", device="auto", compute_type="int8"
+        )
+        faster_whisper_model.return_value.transcribe.assert_called_once_with(
+            str(temp_audio), beam_size=1, vad_filter=True
+        )
+
+    def test_transcribe_audio_in_process_failure(self, whisper_cpp_model):
+        """Test that in-process transcription errors are raised as RuntimeError."""
+        temp_audio = Path(self.temp_dir) / "test.mp3"
+        temp_audio.touch()
+        whisper_cpp_model.return_value.transcribe.side_effect = ValueError("bad audio")
+
+        with pytest.raises(RuntimeError, match="Transcription failed: bad audio"):
+            self.service.transcribe_audio(str(temp_audio))
+
+    def test_transcribe_batch_in_process(self, whisper_cpp_model):
+        """Test that a batch shares one resident model and keeps input order."""
+        audio_files = [Path(self.temp_dir) / f"clip{i}.mp3" for i in range(3)]
+        for audio_file in audio_files:
+            audio_file.touch()
+        whisper_cpp_model.return_value.transcribe.side_effect = lambda path: [
+            unittest.mock.Mock(text=Path(path).stem)
+        ]
+
+        result = self.service.transcribe_batch([str(f) for f in audio_files])
+
+        assert result == ["clip0", "clip1", "clip2"]
+        whisper_cpp_model.assert_called_once_with("base")
+
+    @unittest.mock.patch.object(
+        WhisperTranscriptionService, "is_whisper_available", return_value=True
+    )
+    @unittest.mock.patch("subprocess.run")
+    def test_transcribe_batch_single_subprocess(self, mock_run, mock_available):
+        """Test that a batch is transcribed by one whisper.cpp invocation."""
+        audio_files = [Path(self.temp_dir) / f"clip{i}.mp3" for i in range(2)]
+        for audio_file in audio_files:
+            audio_file.touch()
+
+        # A user's file that happens to share whisper.cpp's output name
+        existing_output = Path(f"{audio_files[1]}.txt")
+        existing_output.write_text("Not a transcript.")
+
+        def _write_outputs(cmd, **kwargs):
+            first_input = cmd[cmd.index("-f") + 1]
+            Path(f"{first_input}.txt").write_text("First clip.")
+            return unittest.mock.Mock(returncode=0, stderr=b"")
+
+        mock_run.side_effect = _write_outputs
+
+        result = self.service.transcribe_batch([str(f) for f in audio_files])
+
+        assert result == ["First clip.", None]
+        mock_run.assert_called_once()
+        cmd = mock_run.call_args[0][0]
+        assert cmd.count("-f") == 2
+        assert not Path(f"{audio_files[0]}.txt").exists()
+        assert existing_output.read_text() == "Not a transcript."
+        existing_output.unlink()
+
     def test_get_available_models(self):
         """Test getting list of available models."""
         models = self.service.get_available_models()
@@ -2,61 +2,68 @@
 Test module for YouTube downloader service.
 """
 
-import shutil
-import tempfile
-import time
+import os
 import unittest.mock
-from pathlib import Path
 
 import pytest
 import yt_dlp
 
 from app.services.youtube_downloader_service import YouTubeDownloaderService
 
+VALID_URLS = [
+    "https://youtube.com/watch?v=dQw4w9WgXcQ",
+    "https://www.youtube.com/watch?v=dQw4w9WgXcQ",
+    "https://youtu.be/dQw4w9WgXcQ",
+    "https://music.youtube.com/watch?v=dQw4w9WgXcQ",
+    "https://m.youtube.com/watch?v=dQw4w9WgXcQ",
+    "https://www.youtube.com/embed/dQw4w9WgXcQ",
+    "https://youtube.com/e/dQw4w9WgXcQ",
+    "https://youtube.com/v/dQw4w9WgXcQ",
+]
+
+INVALID_URLS = [
+    "https://example.com",
+    "https://vimeo.com/123456",
+    "not-a-url",
+    "",
+    "https://youtubee.com/watch?v=123",
+]
+
+
+@pytest.fixture(scope="module")
+def url_service(tmp_path_factory):
+    """Create one service shared by the stateless URL validation cases."""
+    return YouTubeDownloaderService(
+        download_directory=str(tmp_path_factory.mktemp("downloads"))
+    )
+
+
+@pytest.mark.parametrize("url", VALID_URLS)
+def test_is_youtube_url_valid(url_service, url):
+    """Test YouTube URL validation with a valid URL."""
+    assert url_service.is_youtube_url(url)
+
+
+@pytest.mark.parametrize("url", INVALID_URLS)
+def test_is_youtube_url_invalid(url_service, url):
+    """Test YouTube URL validation with an invalid URL."""
+    assert not url_service.is_youtube_url(url)
+
 
 class TestYouTubeDownloaderService:
     """Test cases for YouTubeDownloaderService."""
 
-    def setup_method(self):
-        """Set up test environment."""
-        self.temp_dir = tempfile.mkdtemp()
+    @pytest.fixture(autouse=True)
+    def _service(self, tmp_path):
+        """Create a service downloading into a per-test temporary directory."""
+        self.temp_dir = str(tmp_path)
         self.service = YouTubeDownloaderService(download_directory=self.temp_dir)
 
-    def teardown_method(self):
-        """Clean up test environment."""
-        # Clean up temp directory
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
-
     def test_init_creates_download_directory(self):
         """Test that initialization creates the download directory."""
         assert self.service.download_directory.exists()
         assert self.service.download_directory.is_dir()
 
-    def test_is_youtube_url_valid_urls(self):
-        """Test YouTube URL validation with valid URLs."""
-        valid_urls = [
-            "https://youtube.com/watch?v=dQw4w9WgXcQ",
-            "https://www.youtube.com/watch?v=dQw4w9WgXcQ",
-            "https://youtu.be/dQw4w9WgXcQ",
-            "https://music.youtube.com/watch?v=dQw4w9WgXcQ",
-        ]
-
-        for url in valid_urls:
-            assert self.service.is_youtube_url(url), f"URL should be valid: {url}"
-
-    def test_is_youtube_url_invalid_urls(self):
-        """Test YouTube URL validation with invalid URLs."""
-        invalid_urls = [
-            "https://example.com",
-            "https://vimeo.com/123456",
-            "not-a-url",
-            "",
-            "https://youtubee.com/watch?v=123",
-        ]
-
-        for url in invalid_urls:
-            assert not self.service.is_youtube_url(url), f"URL should be invalid: {url}"
-
     def test_download_audio_invalid_url_raises_error(self):
         """Test that download_audio raises ValueError for invalid URLs."""
         with pytest.raises(ValueError, match="Invalid YouTube URL"):
@@ -109,6 +116,45 @@ class TestYouTubeDownloaderService:
         result = self.service.download_audio("https://youtube.com/watch?v=test")
         assert result is None
 
+    @unittest.mock.patch("yt_dlp.YoutubeDL")
+    def test_download_audios_batch(self, mock_ydl_class):
+        """Test that a batch is downloaded in one yt-dlp call."""
+        mock_ydl = mock_ydl_class.return_value.__enter__.return_value
+        urls = [
+            "https://youtube.com/watch?v=first",
+            "https://youtu.be/second",
+        ]
+        files = [
+            self.service.download_directory / "first.mp3",
+            self.service.download_directory / "second.mp3",
+        ]
+
+        def mock_download(batch):
+            for test_file in files:
+                test_file.touch()
+                self.service._postprocessor_hook(
+                    {"status": "finished", "filepath": str(test_file)}
+                )
+
+        mock_ydl.download.side_effect = mock_download
+
+        result = self.service.download_audios(urls)
+
+        mock_ydl_class.assert_called_once()
+        assert mock_ydl_class.call_args.args[0]["concurrent_fragment_downloads"] == 4
+        mock_ydl.download.assert_called_once_with(urls)
+        assert result == [str(test_file) for test_file in files]
+
+    def test_download_audios_invalid_url_raises_error(self):
+        """Test that one invalid URL rejects the whole batch."""
+        with unittest.mock.patch("yt_dlp.YoutubeDL") as mock_ydl_class:
+            with pytest.raises(ValueError, match="Invalid YouTube URL"):
+                self.service.download_audios(
+                    ["https://youtu.be/valid", "https://example.com"]
+                )
+
+        mock_ydl_class.assert_not_called()
+
     def test_postprocessor_hook(self):
         """Test the postprocessor hook functionality."""
         test_file = self.service.download_directory / "test_audio.mp3"
@@ -127,8 +173,10 @@ class TestYouTubeDownloaderService:
         new_file = self.service.download_directory / "new_audio.mp3"
 
         old_file.touch()
-        time.sleep(0.01)  # Ensure different timestamps
         new_file.touch()
+        # Set distinct modification times rather than sleeping between writes
+        os.utime(old_file, (1_000_000, 1_000_000))
+        os.utime(new_file, (1_000_001, 1_000_001))
 
         result = self.service._find_newest_mp3_file()
         assert result == new_file
@@ -163,7 +211,7 @@ class TestYouTubeDownloaderService:
         test_file = self.service.download_directory / "test_permission.mp3"
         test_file.touch()
 
-        # Mock unlink to raise PermissionError
-        with unittest.mock.patch.object(Path, "unlink", side_effect=PermissionError()):
+        # Mock os.remove to raise PermissionError
+        with unittest.mock.patch("os.remove", side_effect=PermissionError()):
             result = self.service.cleanup_file(str(test_file))
             assert result is False